@@ -1,167 +1,418 @@
-"""API Routes"""
-from fastapi import APIRouter, UploadFile, File
-import pandas as pd
-import io
-
-router = APIRouter()
-app_data = {"df": None}
-
-def get_col(df, candidates):
-    return next((c for c in candidates if c in df.columns), None)
-
-@router.get("/test")
-async def test():
-    return {"message": "API working"}
-
-@router.post("/upload-data")
-async def upload_data(file: UploadFile = File(...)):
-    try:
-        contents = await file.read()
-        df = pd.read_csv(io.StringIO(contents.decode("utf-8")))
-        app_data["df"] = df
-        return {"status": "success", "rows": len(df), "columns": len(df.columns), "preview": df.head(5).to_dict(orient="records")}
-    except Exception as e:
-        return {"status": "error", "message": str(e)}
-
-@router.get("/dashboard-data")
-async def get_dashboard_data():
-    if app_data["df"] is None:
-        return {"total_customers": 0, "churn_rate": 0.0, "at_risk": 0, "avg_score": 0.0, "avg_monthly_charge": 0.0, "churn_distribution": [], "retention_by_segment": [], "behavior_segments": []}
-
-    df = app_data["df"].copy()
-    total = len(df)
-    churn_col = get_col(df, ["churn","Churn","CHURN","churn_status","Churn_Status"])
-    charge_col = get_col(df, ["monthly_charges","MonthlyCharges","monthly_charge"])
-    tenure_col = get_col(df, ["tenure","Tenure","TENURE"])
-
-    if churn_col:
-        df[churn_col] = pd.to_numeric(df[churn_col], errors='coerce').fillna(0)
-        churn_rate = float(df[churn_col].mean() * 100)
-        at_risk = int(df[churn_col].sum())
-    else:
-        churn_rate, at_risk = 0.0, 0
-
-    avg_charge = float(pd.to_numeric(df[charge_col], errors='coerce').mean()) if charge_col else 0.0
-
-    retention_by_segment = []
-    if tenure_col and churn_col:
-        df[tenure_col] = pd.to_numeric(df[tenure_col], errors='coerce').fillna(0)
-        df["_seg"] = pd.cut(df[tenure_col], bins=[0,6,12,24,9999], labels=["New (0-6m)","Growing (6-12m)","Established (1-2y)","Loyal (2y+)"])
-        for seg, grp in df.groupby("_seg", observed=True):
-            if len(grp) > 0:
-                retention_by_segment.append({"segment": str(seg), "retention_rate": round((1 - grp[churn_col].mean()) * 100, 1), "count": len(grp)})
-
-    behavior_segments = []
-    if charge_col:
-        df[charge_col] = pd.to_numeric(df[charge_col], errors='coerce').fillna(0)
-        df["_beh"] = pd.cut(df[charge_col], bins=[0,40,70,90,9999], labels=["Budget","Standard","Premium","Enterprise"])
-        for seg, grp in df.groupby("_beh", observed=True):
-            if len(grp) > 0:
-                behavior_segments.append({"segment": str(seg), "count": len(grp)})
-
-    return {
-        "total_customers": total, "churn_rate": round(churn_rate, 1),
-        "at_risk": at_risk, "avg_score": round(churn_rate / 100, 2),
-        "avg_monthly_charge": round(avg_charge, 2),
-        "churn_distribution": [{"label": "Churned", "value": at_risk}, {"label": "Retained", "value": total - at_risk}],
-        "retention_by_segment": retention_by_segment,
-        "behavior_segments": behavior_segments
-    }
-
-@router.get("/churn-analysis")
-async def get_churn_analysis():
-    if app_data["df"] is None:
-        return {"status": "no_data", "customers": []}
-    df = app_data["df"].copy()
-    churn_col = get_col(df, ["churn","Churn","CHURN","churn_status","Churn_Status"])
-    charge_col = get_col(df, ["monthly_charges","MonthlyCharges","monthly_charge"])
-    tenure_col = get_col(df, ["tenure","Tenure","TENURE"])
-    id_col = get_col(df, ["customer_id","CustomerID","customer_id","id","ID"])
-
-    if churn_col:
-        df[churn_col] = pd.to_numeric(df[churn_col], errors='coerce').fillna(0)
-    if charge_col:
-        df[charge_col] = pd.to_numeric(df[charge_col], errors='coerce').fillna(0)
-    if tenure_col:
-        df[tenure_col] = pd.to_numeric(df[tenure_col], errors='coerce').fillna(0)
-
-    customers = []
-    for _, row in df.iterrows():
-        cid = str(row[id_col]) if id_col else f"CUST-{_}"
-        churn = int(row[churn_col]) if churn_col else 0
-        charge = float(row[charge_col]) if charge_col else 0.0
-        tenure = int(row[tenure_col]) if tenure_col else 0
-        risk = "High" if churn == 1 else ("Medium" if charge > 70 else "Low")
-        customers.append({"id": cid, "tenure": tenure, "monthly_charge": charge, "churn": churn, "risk": risk})
-
-    churned = [c for c in customers if c["churn"] == 1]
-    retained = [c for c in customers if c["churn"] == 0]
-    return {"status": "ok", "total": len(customers), "churned": len(churned), "retained": len(retained), "churn_rate": round(len(churned)/len(customers)*100, 1) if customers else 0, "customers": customers}
-
-@router.get("/behavior-analytics")
-async def get_behavior_analytics():
-    if app_data["df"] is None:
-        return {"status": "no_data", "segments": []}
-    df = app_data["df"].copy()
-    churn_col = get_col(df, ["churn","Churn","CHURN"])
-    charge_col = get_col(df, ["monthly_charges","MonthlyCharges","monthly_charge"])
-    tenure_col = get_col(df, ["tenure","Tenure","TENURE"])
-
-    if charge_col:
-        df[charge_col] = pd.to_numeric(df[charge_col], errors='coerce').fillna(0)
-    if churn_col:
-        df[churn_col] = pd.to_numeric(df[churn_col], errors='coerce').fillna(0)
-    if tenure_col:
-        df[tenure_col] = pd.to_numeric(df[tenure_col], errors='coerce').fillna(0)
-
-    segments = []
-    if charge_col:
-        df["_beh"] = pd.cut(df[charge_col], bins=[0,40,70,90,9999], labels=["Budget ($0-40)","Standard ($40-70)","Premium ($70-90)","Enterprise ($90+)"])
-        for seg, grp in df.groupby("_beh", observed=True):
-            if len(grp) > 0:
-                churn_rate = round(grp[churn_col].mean() * 100, 1) if churn_col else 0
-                avg_charge = round(grp[charge_col].mean(), 2)
-                avg_tenure = round(grp[tenure_col].mean(), 1) if tenure_col else 0
-                segments.append({"segment": str(seg), "count": len(grp), "churn_rate": churn_rate, "avg_charge": avg_charge, "avg_tenure": avg_tenure})
-
-    return {"status": "ok", "segments": segments}
-
-@router.post("/train-model")
-async def train_model():
-    return {"status": "success"}
-
-@router.post("/predict-churn")
-async def predict_churn():
-    return {"predictions": []}
-
-@router.get("/model-metrics")
-async def get_model_metrics():
-    return {"accuracy": 0.0, "precision": 0.0, "recall": 0.0, "f1_score": 0.0, "roc_auc": 0.0}
-
-@router.get("/feature-importance")
-async def get_feature_importance():
-    return []
-
-@router.post("/cluster-users")
-async def cluster_users():
-    return {"clusters": []}
-
-@router.get("/cluster-summary")
-async def get_cluster_summary():
-    return {}
-
-@router.post("/simulate-scenario")
-async def simulate_scenario():
-    return {"predicted_churn_change": 0.0, "revenue_impact": 0.0}
-
-@router.post("/generate-retention-strategy")
-async def generate_retention_strategy():
-    return {"strategies": []}
-
-@router.get("/behavior-segments")
-async def get_behavior_segments():
-    return {"segments": []}
-
-@router.get("/insights")
-async def get_insights():
-    return {"insights": []}
\ No newline at end of file
+"""API Routes"""
+from fastapi import APIRouter, UploadFile, File, Query, Request, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+import json
+from typing import Optional
+from config import settings
+from db.database import get_db
+from services.customer_service import customer_service
+from services.data_service import data_service
+from services.dataset_store import dataset_store
+from services.event_service import dashboard_events
+from services.export_service import export_service, FORMATS
+from services.insight_service import insight_service
+from services.survival_service import survival_service
+from services.ml_service import ml_service
+
+router = APIRouter()
+EMPTY_DASHBOARD = {"total_customers": 0, "churn_rate": 0.0, "at_risk": 0, "avg_score": 0.0, "avg_monthly_charge": 0.0, "churn_distribution": [], "retention_by_segment": [], "behavior_segments": []}
+
+def get_col(df, candidates):
+    return next((c for c in candidates if c in df.columns), None)
+
+def dataset_query():
+    return Query(settings.DEFAULT_DATASET_ID, pattern=settings.DATASET_ID_PATTERN)
+
+@router.get("/test")
+async def test():
+    return {"message": "API working"}
+
+# Parsing, profiling, indexing and the drift check are CPU-bound; as a plain def route the
+# upload runs in the threadpool and reads the spooled file through file.file
+@router.post("/upload-data")
+def upload_data(file: UploadFile = File(...), dataset_id: str = dataset_query(), db: Session = Depends(get_db)):
+    try:
+        entry = dataset_store.put(dataset_id, file.file)
+        df = entry.df
+        return {"status": "success", "dataset_id": dataset_id, "rows": len(df), "columns": len(df.columns), "preview": df.head(5).to_dict(orient="records"), "validation_results": data_service.validate_data(entry.profile), "drift": _check_upload_drift(dataset_id, df, db)}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+def _check_upload_drift(dataset_id, df, db):
+    # Drift is advisory: a file the active model cannot score should still upload
+    try:
+        return ml_service.check_drift(dataset_id, df, db, source="upload")
+    except Exception as e:
+        db.rollback()
+        return {"status": "error", "message": str(e)}
+
+@router.get("/data-profile")
+async def get_data_profile(dataset_id: str = dataset_query()):
+    """Data-quality report served from the sketches stored at upload, without rescanning"""
+    profile = _dataset_profile(dataset_id)
+    if profile is None:
+        return {"status": "no_data"}
+    return data_service.validate_data(profile)
+
+@router.get("/datasets")
+async def list_datasets():
+    return {"datasets": dataset_store.list_datasets(), "memory": dataset_store.memory_usage()}
+
+@router.get("/dashboard-data")
+async def get_dashboard_data(dataset_id: str = dataset_query()):
+    profile = _dataset_profile(dataset_id)
+    return _dashboard_summary(profile) if profile is not None else EMPTY_DASHBOARD
+
+@router.get("/dashboard-stream")
+async def stream_dashboard_data(request: Request, dataset_id: str = dataset_query()):
+    """Server-sent events: a full snapshot on connect, then diffs whenever the dataset changes"""
+    return StreamingResponse(
+        _dashboard_events(request, dataset_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def _dashboard_events(request, dataset_id):
+    version = dashboard_events.current_version(dataset_id)
+    snapshot = await get_dashboard_data(dataset_id)
+    yield _sse("snapshot", version, snapshot)
+
+    # Polling CURRENT picks up uploads published by other worker processes
+    changes = dashboard_events.subscribe(dataset_id, version, poll=lambda: dataset_store.active_version(dataset_id))
+    async for change in changes:
+        if await request.is_disconnected():
+            break
+        if change is None:
+            yield ": keep-alive\n\n"
+            continue
+
+        version, reason = change
+        latest = await get_dashboard_data(dataset_id)
+        diff = {key: value for key, value in latest.items() if snapshot.get(key) != value}
+        snapshot = latest
+        if diff:
+            yield _sse("diff", version, {"reason": reason, "changes": diff})
+
+def _sse(event, version, payload):
+    return f"event: {event}\nid: {version}\ndata: {json.dumps(payload)}\n\n"
+
+TENURE_SEGMENTS = [(0, 6, "New (0-6m)"), (6, 12, "Growing (6-12m)"), (12, 24, "Established (1-2y)"), (24, 9999, "Loyal (2y+)")]
+CHARGE_SEGMENTS = [(0, 40, "Budget"), (40, 70, "Standard"), (70, 90, "Premium"), (90, 9999, "Enterprise")]
+
+def _dataset_profile(dataset_id):
+    entry = dataset_store.get(dataset_id)
+    if entry is None:
+        return None
+    if entry.profile is not None:
+        return entry.profile
+    # Versions stored without a usable profile get one rebuilt once and cached with the data
+    return dataset_store.get_aggregate(dataset_id, "profile", _build_profile)
+
+def _build_profile(df):
+    from services.profiling import DataProfile
+
+    profile = DataProfile()
+    profile.update(df)
+    return profile
+
+def _segment_counts(sketch, segments):
+    # Segments are (low, high] like pd.cut; values outside every segment are left out
+    ranks = sketch.rank([segments[0][0]] + [high for _, high, _ in segments])
+    return [later - earlier for earlier, later in zip(ranks, ranks[1:])]
+
+def _dashboard_summary(profile):
+    """Dashboard figures read from the upload's sketches; nothing here touches the rows"""
+    total = profile.rows
+    churn = profile.columns.get(profile.target_col) if profile.target_col else None
+    charge_col = get_col(profile, ["monthly_charges","MonthlyCharges","monthly_charge"])
+    tenure_col = get_col(profile, ["tenure","Tenure","TENURE"])
+
+    # Values that are not numbers count as not churned, as the dashboard always has
+    at_risk = int(churn.total) if churn else 0
+    churn_rate = churn.total / total * 100 if churn and total else 0.0
+
+    charges = profile.columns[charge_col] if charge_col else None
+    avg_charge = charges.total / charges.numeric if charges and charges.numeric else 0.0
+
+    retention_by_segment = []
+    if tenure_col and churn:
+        tenure = profile.columns[tenure_col]
+        counts = _segment_counts(tenure.quantile_sketch, TENURE_SEGMENTS)
+        churned = _segment_counts(tenure.churned_sketch, TENURE_SEGMENTS)
+        for (_, _, seg), count, lost in zip(TENURE_SEGMENTS, counts, churned):
+            if count > 0:
+                retention_by_segment.append({"segment": seg, "retention_rate": round((1 - min(lost, count) / count) * 100, 1), "count": count})
+
+    behavior_segments = []
+    if charges:
+        for (_, _, seg), count in zip(CHARGE_SEGMENTS, _segment_counts(charges.quantile_sketch, CHARGE_SEGMENTS)):
+            if count > 0:
+                behavior_segments.append({"segment": seg, "count": count})
+
+    return {
+        "total_customers": total, "churn_rate": round(churn_rate, 1),
+        "at_risk": at_risk, "avg_score": round(churn_rate / 100, 2),
+        "avg_monthly_charge": round(avg_charge, 2),
+        "churn_distribution": [{"label": "Churned", "value": at_risk}, {"label": "Retained", "value": total - at_risk}],
+        "retention_by_segment": retention_by_segment,
+        "behavior_segments": behavior_segments
+    }
+
+@router.get("/churn-analysis")
+async def get_churn_analysis(dataset_id: str = dataset_query()):
+    entry = dataset_store.get(dataset_id)
+    if entry is None:
+        return {"status": "no_data", "customers": []}
+    return _churn_analysis(entry.df)
+
+def _churn_analysis(df):
+    import pandas as pd
+
+    df = df.copy(deep=False)
+    churn_col = get_col(df, ["churn","Churn","CHURN","churn_status","Churn_Status"])
+    charge_col = get_col(df, ["monthly_charges","MonthlyCharges","monthly_charge"])
+    tenure_col = get_col(df, ["tenure","Tenure","TENURE"])
+    id_col = get_col(df, ["customer_id","CustomerID","customer_id","id","ID"])
+
+    if churn_col:
+        df[churn_col] = pd.to_numeric(df[churn_col], errors='coerce').fillna(0)
+    if charge_col:
+        df[charge_col] = pd.to_numeric(df[charge_col], errors='coerce').fillna(0)
+    if tenure_col:
+        df[tenure_col] = pd.to_numeric(df[tenure_col], errors='coerce').fillna(0)
+
+    customers = []
+    for _, row in df.iterrows():
+        cid = str(row[id_col]) if id_col else f"CUST-{_}"
+        churn = int(row[churn_col]) if churn_col else 0
+        charge = float(row[charge_col]) if charge_col else 0.0
+        tenure = int(row[tenure_col]) if tenure_col else 0
+        risk = "High" if churn == 1 else ("Medium" if charge > 70 else "Low")
+        customers.append({"id": cid, "tenure": tenure, "monthly_charge": charge, "churn": churn, "risk": risk})
+
+    churned = [c for c in customers if c["churn"] == 1]
+    retained = [c for c in customers if c["churn"] == 0]
+    return {"status": "ok", "total": len(customers), "churned": len(churned), "retained": len(retained), "churn_rate": round(len(churned)/len(customers)*100, 1) if customers else 0, "customers": customers}
+
+@router.get("/customers/search")
+async def search_customers(
+    dataset_id: str = dataset_query(),
+    prefix: Optional[str] = Query(None, max_length=100, description="Customer id prefix"),
+    min_tenure: Optional[float] = None,
+    max_tenure: Optional[float] = None,
+    min_charge: Optional[float] = None,
+    max_charge: Optional[float] = None,
+    min_probability: Optional[float] = Query(None, ge=0, le=1),
+    max_probability: Optional[float] = Query(None, ge=0, le=1),
+    risk: Optional[str] = Query(None, description="Comma-separated risk levels: HIGH, MEDIUM, LOW"),
+    cluster: Optional[str] = Query(None, description="Comma-separated cluster ids"),
+    sort: str = Query("risk", description="risk (highest churn probability first) or customer_id"),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=1000),
+    db: Session = Depends(get_db)
+):
+    """Indexed customer lookup by id prefix, ranges and risk or cluster, paged"""
+    try:
+        clusters = [int(c) for c in cluster.split(",")] if cluster else None
+    except ValueError:
+        return {"status": "error", "message": "cluster must be comma-separated integers"}
+    return customer_service.search(
+        dataset_id,
+        db,
+        prefix=prefix,
+        ranges={
+            "tenure": (min_tenure, max_tenure),
+            "monthly_charges": (min_charge, max_charge),
+            "churn_probability": (min_probability, max_probability)
+        },
+        risk_levels=[r.strip() for r in risk.split(",")] if risk else None,
+        clusters=clusters,
+        sort=sort,
+        offset=offset,
+        limit=limit
+    )
+
+@router.get("/export/customers")
+async def export_customers(
+    dataset_id: str = dataset_query(),
+    fmt: str = Query("csv", alias="format", description="csv, ndjson or parquet"),
+    risk: Optional[str] = Query(None, description="Comma-separated risk levels: HIGH, MEDIUM, LOW"),
+    cluster: Optional[str] = Query(None, description="Comma-separated cluster ids"),
+    segment: Optional[str] = Query(None, description="Comma-separated tenure bands, charge tiers or 'band / tier' segments"),
+    compress: bool = Query(True, description="gzip CSV and NDJSON; Parquet is always compressed"),
+    db: Session = Depends(get_db)
+):
+    """Stream scored customers with their risk level, cluster and segment"""
+    try:
+        clusters = [int(c) for c in cluster.split(",")] if cluster else None
+    except ValueError:
+        return {"status": "error", "message": "cluster must be comma-separated integers"}
+    export = export_service.prepare(
+        dataset_id,
+        db,
+        fmt=fmt,
+        risk_levels=[r.strip() for r in risk.split(",")] if risk else None,
+        clusters=clusters,
+        segments=[s.strip() for s in segment.split(",")] if segment else None
+    )
+    if export["status"] != "ok":
+        return export
+
+    media_type, extension = FORMATS[fmt]
+    gzipped = compress and fmt != "parquet"
+    filename = f"{dataset_id}_scored_customers.{extension}" + (".gz" if gzipped else "")
+    # A sync generator is iterated in the threadpool, keeping the event loop free during long exports
+    return StreamingResponse(
+        export_service.stream(
+            dataset_id, fmt, export["last_id"],
+            export["risk_levels"], export["clusters"], export["segments"], compress
+        ),
+        media_type="application/gzip" if gzipped else media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.get("/survival")
+async def get_survival(
+    dataset_id: str = dataset_query(),
+    by: str = Query("none", description="none, charge_tier or cluster"),
+    groups: Optional[str] = Query(None, description="Comma-separated group names to include"),
+    max_tenure: Optional[int] = Query(None, ge=0),
+    db: Session = Depends(get_db)
+):
+    """Kaplan-Meier retention and hazard curves by tenure month"""
+    selected = [g.strip() for g in groups.split(",")] if groups else None
+    return survival_service.get_survival(dataset_id, db, by, selected, max_tenure)
+
+@router.get("/behavior-analytics")
+async def get_behavior_analytics(dataset_id: str = dataset_query()):
+    data = dataset_store.get_aggregate(dataset_id, "behavior_analytics", _behavior_analytics)
+    return data if data is not None else {"status": "no_data", "segments": []}
+
+def _behavior_analytics(df):
+    import pandas as pd
+
+    df = df.copy(deep=False)
+    churn_col = get_col(df, ["churn","Churn","CHURN"])
+    charge_col = get_col(df, ["monthly_charges","MonthlyCharges","monthly_charge"])
+    tenure_col = get_col(df, ["tenure","Tenure","TENURE"])
+
+    if charge_col:
+        df[charge_col] = pd.to_numeric(df[charge_col], errors='coerce').fillna(0)
+    if churn_col:
+        df[churn_col] = pd.to_numeric(df[churn_col], errors='coerce').fillna(0)
+    if tenure_col:
+        df[tenure_col] = pd.to_numeric(df[tenure_col], errors='coerce').fillna(0)
+
+    segments = []
+    if charge_col:
+        df["_beh"] = pd.cut(df[charge_col], bins=[0,40,70,90,9999], labels=["Budget ($0-40)","Standard ($40-70)","Premium ($70-90)","Enterprise ($90+)"])
+        for seg, grp in df.groupby("_beh", observed=True):
+            if len(grp) > 0:
+                churn_rate = round(grp[churn_col].mean() * 100, 1) if churn_col else 0
+                avg_charge = round(grp[charge_col].mean(), 2)
+                avg_tenure = round(grp[tenure_col].mean(), 1) if tenure_col else 0
+                segments.append({"segment": str(seg), "count": len(grp), "churn_rate": churn_rate, "avg_charge": avg_charge, "avg_tenure": avg_tenure})
+
+    return {"status": "ok", "segments": segments}
+
+# Training, scoring and drift checks are CPU-bound. Plain def routes run in the threadpool,
+# so the event loop keeps answering /health and the dashboard streams meanwhile
+@router.post("/train-model")
+def train_model(
+    dataset_id: str = dataset_query(),
+    tune: bool = Query(False),
+    db: Session = Depends(get_db)
+):
+    entry = dataset_store.get(dataset_id)
+    if entry is None:
+        return {"status": "no_data"}
+    try:
+        return {"status": "success", **ml_service.train_churn_model(dataset_id, entry.df, db, tune=tune, profile=entry.profile)}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+@router.post("/predict-churn")
+def predict_churn(dataset_id: str = dataset_query(), db: Session = Depends(get_db)):
+    entry = dataset_store.get(dataset_id)
+    if entry is None:
+        return {"predictions": []}
+    try:
+        return {"predictions": ml_service.predict_churn(dataset_id, entry.df, db)}
+    except Exception as e:
+        return {"status": "error", "message": str(e), "predictions": []}
+
+@router.get("/model-metrics")
+async def get_model_metrics(dataset_id: str = dataset_query(), db: Session = Depends(get_db)):
+    return ml_service.get_model_metrics(db, dataset_id)
+
+@router.get("/threshold-analysis")
+async def get_threshold_analysis(dataset_id: str = dataset_query(), db: Session = Depends(get_db)):
+    return ml_service.get_threshold_analysis(db, dataset_id)
+
+@router.get("/drift")
+async def get_drift_history(
+    dataset_id: Optional[str] = Query(None, pattern=settings.DATASET_ID_PATTERN),
+    limit: int = Query(50, ge=1, le=1000),
+    db: Session = Depends(get_db)
+):
+    """Drift reports against the training data, newest first"""
+    return {"reports": ml_service.get_drift_history(db, dataset_id, limit)}
+
+@router.post("/drift/check")
+def check_drift(dataset_id: str = dataset_query(), db: Session = Depends(get_db)):
+    entry = dataset_store.get(dataset_id)
+    if entry is None:
+        return {"status": "no_data"}
+    try:
+        report = ml_service.check_drift(dataset_id, entry.df, db)
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+    return report if report is not None else {"status": "no_model"}
+
+@router.get("/drift/reference")
+async def get_drift_reference(dataset_id: str = dataset_query(), db: Session = Depends(get_db)):
+    return ml_service.get_drift_reference(db, dataset_id)
+
+@router.get("/feature-importance")
+async def get_feature_importance(dataset_id: str = dataset_query(), db: Session = Depends(get_db)):
+    return ml_service.get_feature_importance(db, dataset_id)
+
+# k-means is CPU-bound, so this runs in the threadpool
+@router.post("/cluster-users")
+def cluster_users(dataset_id: str = dataset_query(), db: Session = Depends(get_db)):
+    entry = dataset_store.get(dataset_id)
+    if entry is None:
+        return {"clusters": []}
+    try:
+        return ml_service.cluster_customers(dataset_id, entry.df, db, profile=entry.profile)
+    except Exception as e:
+        return {"status": "error", "message": str(e), "clusters": []}
+
+@router.get("/cluster-summary")
+async def get_cluster_summary(dataset_id: str = dataset_query(), db: Session = Depends(get_db)):
+    return ml_service.get_cluster_summary(db, dataset_id)
+
+@router.post("/simulate-scenario")
+async def simulate_scenario(dataset_id: str = dataset_query()):
+    return {"predicted_churn_change": 0.0, "revenue_impact": 0.0}
+
+@router.get("/retention-strategy")
+async def get_retention_strategy(dataset_id: str = dataset_query(), db: Session = Depends(get_db)):
+    return insight_service.get_saved_strategies(dataset_id, db)
+
+@router.post("/generate-retention-strategy")
+async def generate_retention_strategy(
+    dataset_id: str = dataset_query(),
+    limit: int = Query(6, ge=1, le=50),
+    db: Session = Depends(get_db)
+):
+    return {"strategies": insight_service.generate_strategies(dataset_id, db, limit)}
+
+@router.get("/behavior-segments")
+async def get_behavior_segments(dataset_id: str = dataset_query()):
+    return {"segments": []}
+
+@router.get("/insights")
+async def get_insights(dataset_id: str = dataset_query(), db: Session = Depends(get_db)):
+    return {"insights": insight_service.generate_insights(dataset_id, db)}
\ No newline at end of file
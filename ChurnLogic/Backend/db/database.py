@@ -1,19 +1,30 @@
-"""Database Connection"""
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from config import settings
-
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-def init_db():
-    """Initialize database"""
-    from db.models import Base
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+"""Database Connection"""
+import threading
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from config import settings
+
+engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+_init_lock = threading.Lock()
+_initialized = False
+
+def get_db():
+    init_db()
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def init_db():
+    """Initialize database (once per process, on first use or during warmup)"""
+    global _initialized
+    if _initialized:
+        return
+    with _init_lock:
+        if not _initialized:
+            from db.models import Base
+            Base.metadata.create_all(bind=engine)
+            _initialized = True
\ No newline at end of file
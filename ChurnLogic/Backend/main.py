@@ -1,45 +1,94 @@
-"""ChurnLogic FastAPI Backend"""
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-import logging
-from db.database import init_db
-from api.routes import router
-
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-app = FastAPI(
-    title="ChurnLogic API",
-    description="AI-powered Customer Retention Intelligence",
-    version="1.0.0"
-)
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Initialize database
-init_db()
-
-# Include routes
-app.include_router(router, prefix="/api")
-
-@app.get("/health")
-async def health_check():
-    return {"status": "healthy", "service": "ChurnLogic"}
-
-@app.get("/")
-async def root():
-    return {
-        "message": "ChurnLogic API",
-        "version": "1.0.0",
-        "docs": "/docs"
-    }
-
-if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+"""ChurnLogic FastAPI Backend"""
+import time
+
+_import_started = time.perf_counter()
+
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
+import asyncio
+import logging
+from config import settings
+from db.database import init_db
+from api.routes import router
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+startup_state = {"startup_seconds": None, "warm": False, "warmup_seconds": None}
+
+def warmup():
+    """Load the database schema, pandas, the ML stack and the active model"""
+    started = time.perf_counter()
+    init_db()
+
+    import pandas  # noqa: F401
+    import ml.clustering  # noqa: F401
+    import ml.model  # noqa: F401
+    import ml.preprocessing  # noqa: F401
+    from ml.registry import model_registry
+    model_registry.get_active(settings.DEFAULT_DATASET_ID)
+
+    startup_state["warm"] = True
+    startup_state["warmup_seconds"] = round(time.perf_counter() - started, 3)
+    logger.info(f"Warmup complete in {startup_state['warmup_seconds']}s")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.STARTUP_MODE == "eager":
+        warmup()
+    elif settings.STARTUP_MODE == "background":
+        # Keep a reference so the task is not garbage collected mid-flight
+        app.state.warmup_task = asyncio.create_task(run_in_threadpool(warmup))
+
+    startup_state["startup_seconds"] = round(time.perf_counter() - _import_started, 3)
+    logger.info(f"Startup complete in {startup_state['startup_seconds']}s ({settings.STARTUP_MODE} mode)")
+    yield
+
+app = FastAPI(
+    title="ChurnLogic API",
+    description="AI-powered Customer Retention Intelligence",
+    version="1.0.0",
+    lifespan=lifespan
+)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+# Include routes
+app.include_router(router, prefix="/api")
+
+@app.get("/health")
+async def health_check():
+    return {"status": "healthy", "service": "ChurnLogic", **startup_state}
+
+@app.get("/")
+async def root():
+    return {
+        "message": "ChurnLogic API",
+        "version": "1.0.0",
+        "docs": "/docs"
+    }
+
+if __name__ == "__main__":
+    import argparse
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run the ChurnLogic API")
+    parser.add_argument(
+        "--workers", type=int, default=settings.WORKERS,
+        help="Worker processes. More than one starts production mode without auto-reload; "
+             "workers share datasets and models through memory-mapped files."
+    )
+    args = parser.parse_args()
+
+    if args.workers > 1:
+        uvicorn.run("main:app", host=settings.HOST, port=settings.PORT, workers=args.workers)
+    else:
+        uvicorn.run("main:app", host=settings.HOST, port=settings.PORT, reload=True)
\ No newline at end of file
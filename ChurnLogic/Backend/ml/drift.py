@@ -0,0 +1,104 @@
+"""Feature Drift Monitoring"""
+import numpy as np
+import logging
+from typing import Dict, Any, List
+
+logger = logging.getLogger(__name__)
+
+# Floor for empty bins so PSI stays finite
+EPSILON = 1e-4
+
+def population_stability_index(expected: np.ndarray, actual: np.ndarray) -> np.ndarray:
+    """PSI per row of two (features x bins) proportion matrices"""
+    expected = np.maximum(expected, EPSILON)
+    actual = np.maximum(actual, EPSILON)
+    return np.sum((actual - expected) * np.log(actual / expected), axis=1)
+
+def binned_ks(expected: np.ndarray, actual: np.ndarray) -> np.ndarray:
+    """Kolmogorov-Smirnov statistic per row, from the binned CDFs"""
+    return np.abs(np.cumsum(actual, axis=1) - np.cumsum(expected, axis=1)).max(axis=1)
+
+class DriftReference:
+    """Per-feature reference histograms of the training data, saved with the model.
+
+    Bin edges are the training deciles of each feature, so each bin holds
+    about a tenth of the training rows and PSI is sensitive across the whole
+    range. Only the edges and the bin proportions are kept, not the data.
+    """
+    def __init__(self, n_bins: int = 10):
+        self.n_bins = n_bins
+        self.feature_names: List[str] = []
+        self.edges: np.ndarray = None
+        self.proportions: np.ndarray = None
+        self.rows = 0
+
+    def fit(self, X: np.ndarray, feature_names: list) -> 'DriftReference':
+        self.feature_names = list(feature_names)
+        quantiles = np.linspace(0, 1, self.n_bins + 1)[1:-1]
+        self.edges = np.quantile(X, quantiles, axis=0).T
+        self.proportions = self._proportions(self.bin_counts(X))
+        self.rows = len(X)
+        return self
+
+    def bin_counts(self, X: np.ndarray) -> np.ndarray:
+        """(features x bins) histogram of X in a single bincount over all features"""
+        n_features = len(self.feature_names)
+        bins = np.empty(X.shape, dtype=np.int64)
+        for j in range(n_features):
+            bins[:, j] = np.searchsorted(self.edges[j], X[:, j], side='right')
+        # Offset each feature's bins so one bincount fills the whole matrix
+        bins += np.arange(n_features) * self.n_bins
+        counts = np.bincount(bins.ravel(), minlength=n_features * self.n_bins)
+        return counts.reshape(n_features, self.n_bins)
+
+    @staticmethod
+    def _proportions(counts: np.ndarray) -> np.ndarray:
+        totals = counts.sum(axis=1, keepdims=True)
+        return counts / np.maximum(totals, 1)
+
+    def accumulator(self) -> 'DriftAccumulator':
+        return DriftAccumulator(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'rows': self.rows,
+            'features': [
+                {'feature': name, 'proportions': self.proportions[j].round(4).tolist()}
+                for j, name in enumerate(self.feature_names)
+            ]
+        }
+
+class DriftAccumulator:
+    """Running histogram of new data against a reference, fed one batch at a time"""
+    def __init__(self, reference: DriftReference):
+        self.reference = reference
+        self.counts = np.zeros((len(reference.feature_names), reference.n_bins), dtype=np.int64)
+        self.rows = 0
+
+    def update(self, X: np.ndarray) -> 'DriftAccumulator':
+        self.counts += self.reference.bin_counts(X)
+        self.rows += len(X)
+        return self
+
+    def report(self, psi_threshold: float = 0.2) -> Dict[str, Any]:
+        """PSI and KS per feature for everything seen so far"""
+        actual = self.reference._proportions(self.counts)
+        psi = population_stability_index(self.reference.proportions, actual)
+        ks = binned_ks(self.reference.proportions, actual)
+
+        features = [
+            {
+                'feature': name,
+                'psi': round(float(psi[j]), 4),
+                'ks': round(float(ks[j]), 4),
+                # Conventional PSI bands: < 0.1 stable, 0.1-0.2 moderate, above that significant
+                'status': 'drift' if psi[j] >= psi_threshold else 'moderate' if psi[j] >= psi_threshold / 2 else 'stable'
+            }
+            for j, name in enumerate(self.reference.feature_names)
+        ]
+        return {
+            'rows': self.rows,
+            'max_psi': round(float(psi.max()), 4) if len(psi) else 0.0,
+            'drifted_features': [f['feature'] for f in features if f['status'] == 'drift'],
+            'features': sorted(features, key=lambda f: f['psi'], reverse=True)
+        }
\ No newline at end of file
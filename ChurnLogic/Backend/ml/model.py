@@ -1,147 +1,203 @@
-"""Churn Prediction Model"""
-import numpy as np
-import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LogisticRegression
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, roc_auc_score
-import logging
-from typing import Dict, Any, Tuple
-from datetime import datetime
-
-logger = logging.getLogger(__name__)
-
-class ChurnPredictionModel:
-    def __init__(self):
-        self.xgb_model = RandomForestClassifier(
-            n_estimators=100,
-            max_depth=15,
-            random_state=42,
-            n_jobs=-1
-        )
-        
-        self.lr_model = LogisticRegression(
-            max_iter=1000,
-            random_state=42,
-            n_jobs=-1
-        )
-        
-        self.primary_model = self.xgb_model
-        self.feature_names = None
-        self.metrics = {}
-        self.model_version = None
-    
-    def train(
-        self,
-        X: np.ndarray,
-        y: np.ndarray,
-        feature_names: list,
-        test_size: float = 0.2,
-        random_state: int = 42
-    ) -> Dict[str, Any]:
-        """Train all models"""
-        logger.info("Starting model training...")
-        
-        self.feature_names = feature_names
-        
-        # Split data
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=test_size, random_state=random_state, stratify=y
-        )
-        
-        logger.info(f"Train set: {X_train.shape}, Test set: {X_test.shape}")
-        
-        # Train Random Forest
-        logger.info("Training Random Forest...")
-        self.xgb_model.fit(X_train, y_train)
-        
-        # Train Logistic Regression
-        logger.info("Training Logistic Regression...")
-        self.lr_model.fit(X_train, y_train)
-        
-        # Evaluate
-        logger.info("Evaluating models...")
-        metrics = self._evaluate_models(X_test, y_test)
-        self.metrics = metrics
-        
-        self.model_version = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        logger.info("Training complete!")
-        return metrics
-    
-    def _evaluate_models(self, X_test: np.ndarray, y_test: np.ndarray) -> Dict[str, Any]:
-        """Evaluate all models"""
-        results = {}
-        
-        for name, model in [
-            ('random_forest', self.xgb_model),
-            ('logistic_regression', self.lr_model)
-        ]:
-            y_pred = model.predict(X_test)
-            y_proba = model.predict_proba(X_test)[:, 1]
-            
-            results[name] = {
-                'accuracy': accuracy_score(y_test, y_pred),
-                'precision': precision_score(y_test, y_pred, zero_division=0),
-                'recall': recall_score(y_test, y_pred, zero_division=0),
-                'f1': f1_score(y_test, y_pred, zero_division=0),
-                'roc_auc': roc_auc_score(y_test, y_proba)
-            }
-        
-        results['primary_model'] = 'random_forest'
-        results['xgboost'] = results['random_forest']
-        
-        logger.info(f"RF - Accuracy: {results['random_forest']['accuracy']:.4f}")
-        
-        return results
-    
-    def predict(self, X: np.ndarray) -> np.ndarray:
-        """Predict churn probability"""
-        return self.primary_model.predict_proba(X)[:, 1]
-    
-    def predict_batch(self, X: np.ndarray) -> Dict[str, Any]:
-        """Predict for batch of customers"""
-        probabilities = self.predict(X)
-        
-        risk_levels = []
-        for prob in probabilities:
-            if prob > 0.7:
-                risk_levels.append('HIGH')
-            elif prob > 0.4:
-                risk_levels.append('MEDIUM')
-            else:
-                risk_levels.append('LOW')
-        
-        return {
-            'probabilities': probabilities.tolist(),
-            'risk_levels': risk_levels,
-            'count_high_risk': sum(1 for r in risk_levels if r == 'HIGH'),
-            'count_medium_risk': sum(1 for r in risk_levels if r == 'MEDIUM'),
-            'count_low_risk': sum(1 for r in risk_levels if r == 'LOW'),
-            'average_probability': float(np.mean(probabilities))
-        }
-    
-    def get_feature_importance(self) -> list:
-        """Get feature importance from model"""
-        if hasattr(self.primary_model, 'feature_importances_'):
-            importance = self.primary_model.feature_importances_
-            
-            features_importance = [
-                {
-                    'feature': name,
-                    'importance': float(imp)
-                }
-                for name, imp in zip(self.feature_names, importance)
-            ]
-            
-            features_importance.sort(key=lambda x: x['importance'], reverse=True)
-            
-            return features_importance[:15]
-        
-        return []
-    
-    def get_metrics(self) -> Dict[str, Any]:
-        """Get model metrics"""
-        return self.metrics
-
-churn_model = ChurnPredictionModel()
\ No newline at end of file
+"""Churn Prediction Model"""
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+from sklearn.linear_model import LogisticRegression
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import precision_score, recall_score, f1_score
+from ml.calibration import ProbabilityCalibrator, ThresholdOptimizer
+from ml.training import TrainingOrchestrator, score_probabilities
+import logging
+from typing import Dict, Any, Tuple
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+class ChurnPredictionModel:
+    def __init__(
+        self,
+        calibration_method: str = 'isotonic',
+        customer_value: float = 500.0,
+        contact_cost: float = 20.0,
+        success_rate: float = 0.3,
+        high_multiple: float = 2.0,
+        cv_folds: int = 5,
+        n_jobs: int = -1
+    ):
+        self.xgb_model = RandomForestClassifier(
+            n_estimators=100,
+            max_depth=15,
+            random_state=42,
+            n_jobs=-1
+        )
+        
+        self.lr_model = LogisticRegression(
+            max_iter=1000,
+            random_state=42,
+            n_jobs=-1
+        )
+        
+        self.primary_model = self.xgb_model
+        self.calibrator = ProbabilityCalibrator(calibration_method)
+        self.threshold_optimizer = ThresholdOptimizer(customer_value, contact_cost, success_rate, high_multiple)
+        self.thresholds = {'high': 0.7, 'medium': 0.4}
+        self.orchestrator = TrainingOrchestrator(n_folds=cv_folds, n_jobs=n_jobs)
+        self.hyperparameters = {}
+        self.feature_names = None
+        self.metrics = {}
+        self.model_version = None
+    
+    def train(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        feature_names: list,
+        test_size: float = 0.2,
+        random_state: int = 42,
+        calibration_size: float = 0.25,
+        tuner=None
+    ) -> Dict[str, Any]:
+        """Train all models, then calibrate the primary model and tune its risk thresholds.
+
+        If a tuner is given, its search picks the Random Forest hyperparameters
+        on the training split before the final fit.
+        """
+        logger.info("Starting model training...")
+        
+        self.feature_names = feature_names
+        
+        # Split data
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=test_size, random_state=random_state, stratify=y
+        )
+        
+        # Hold out part of the training data for calibration and threshold tuning
+        X_train, X_cal, y_train, y_cal = train_test_split(
+            X_train, y_train, test_size=calibration_size, random_state=random_state, stratify=y_train
+        )
+        
+        logger.info(f"Train set: {X_train.shape}, Calibration set: {X_cal.shape}, Test set: {X_test.shape}")
+        
+        if tuner is not None:
+            logger.info("Searching Random Forest hyperparameters...")
+            self.xgb_model.set_params(**tuner.search(X_train, y_train))
+        
+        # Fit Random Forest and Logistic Regression and their CV folds concurrently
+        fitted, cv_metrics = self.orchestrator.run(
+            {'random_forest': self.xgb_model, 'logistic_regression': self.lr_model},
+            X_train, y_train
+        )
+        self.xgb_model = fitted['random_forest']
+        self.lr_model = fitted['logistic_regression']
+        self.primary_model = self.xgb_model
+        self.hyperparameters = {
+            name: value for name, value in self.xgb_model.get_params().items()
+            if name in ('n_estimators', 'max_depth', 'min_samples_leaf', 'max_features')
+        }
+        
+        # Calibrate and tune thresholds on data the models have not seen. The thresholds are
+        # tuned on out-of-fold calibrated probabilities, not on the calibrator's own fit.
+        logger.info(f"Calibrating probabilities ({self.calibrator.method})...")
+        cal_proba = self.calibrator.cross_fit(
+            self.primary_model.predict_proba(X_cal)[:, 1], y_cal,
+            n_folds=self.orchestrator.n_folds, random_state=random_state
+        )
+        self.thresholds = self.threshold_optimizer.fit(y_cal, cal_proba)
+        
+        # Evaluate
+        logger.info("Evaluating models...")
+        metrics = self._evaluate_models(X_test, y_test)
+        metrics['tuned_thresholds'] = self._evaluate_thresholds(X_test, y_test)
+        metrics['cross_validation'] = cv_metrics
+        if tuner is not None:
+            metrics['tuning'] = tuner.results
+        self.metrics = metrics
+        
+        # Microseconds keep versions unique when several datasets train at once
+        self.model_version = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        
+        logger.info("Training complete!")
+        return metrics
+    
+    def _evaluate_models(self, X_test: np.ndarray, y_test: np.ndarray) -> Dict[str, Any]:
+        """Evaluate all models"""
+        results = {}
+        
+        for name, model in [
+            ('random_forest', self.xgb_model),
+            ('logistic_regression', self.lr_model)
+        ]:
+            results[name] = score_probabilities(y_test, model.predict_proba(X_test)[:, 1])
+        
+        results['primary_model'] = 'random_forest'
+        results['xgboost'] = results['random_forest']
+        
+        logger.info(f"RF - Accuracy: {results['random_forest']['accuracy']:.4f}")
+        
+        return results
+    
+    def _evaluate_thresholds(self, X_test: np.ndarray, y_test: np.ndarray) -> Dict[str, Any]:
+        """Evaluate the calibrated primary model at the tuned HIGH threshold"""
+        y_proba = self.predict(X_test)
+        y_pred = (y_proba >= self.thresholds['high']).astype(int)
+        
+        return {
+            'high': self.thresholds['high'],
+            'medium': self.thresholds['medium'],
+            'precision': precision_score(y_test, y_pred, zero_division=0),
+            'recall': recall_score(y_test, y_pred, zero_division=0),
+            'f1': f1_score(y_test, y_pred, zero_division=0),
+            'targeted': int(y_pred.sum())
+        }
+    
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Predict calibrated churn probability"""
+        probabilities = self.primary_model.predict_proba(X)[:, 1]
+        if self.calibrator.calibrator is not None:
+            probabilities = self.calibrator.transform(probabilities)
+        return probabilities
+    
+    def predict_batch(self, X: np.ndarray) -> Dict[str, Any]:
+        """Predict for batch of customers"""
+        probabilities = self.predict(X)
+        
+        risk_levels = np.where(
+            probabilities >= self.thresholds['high'], 'HIGH',
+            np.where(probabilities >= self.thresholds['medium'], 'MEDIUM', 'LOW')
+        )
+        
+        return {
+            'probabilities': probabilities.tolist(),
+            'risk_levels': risk_levels.tolist(),
+            'count_high_risk': int((risk_levels == 'HIGH').sum()),
+            'count_medium_risk': int((risk_levels == 'MEDIUM').sum()),
+            'count_low_risk': int((risk_levels == 'LOW').sum()),
+            'average_probability': float(np.mean(probabilities))
+        }
+    
+    def get_feature_importance(self) -> list:
+        """Get feature importance from model"""
+        if hasattr(self.primary_model, 'feature_importances_'):
+            importance = self.primary_model.feature_importances_
+            
+            features_importance = [
+                {
+                    'feature': name,
+                    'importance': float(imp)
+                }
+                for name, imp in zip(self.feature_names, importance)
+            ]
+            
+            features_importance.sort(key=lambda x: x['importance'], reverse=True)
+            
+            return features_importance[:15]
+        
+        return []
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get model metrics"""
+        return self.metrics
+    
+    def get_threshold_analysis(self) -> Dict[str, Any]:
+        """Get tuned thresholds and the precision/recall/value curves behind them"""
+        return self.threshold_optimizer.get_summary()
\ No newline at end of file
@@ -0,0 +1,91 @@
+"""Model Artifact Registry"""
+import os
+import re
+import threading
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_FILE = "ACTIVE"
+
+class ModelRegistry:
+    """Stores trained model bundles on disk and tracks the active version of each dataset.
+
+    Each dataset has its own model directory and ACTIVE pointer, so training
+    on one dataset never changes the model another dataset is scored with.
+    Bundles are written uncompressed so joblib can memory-map their plain
+    numpy arrays on load. The Random Forest trees are still unpickled into
+    private memory, so every worker holds its own copy of each model it has
+    loaded; at most max_loaded of them are kept, least recently used first
+    out. Activation is an atomic rename of the ACTIVE pointer; each worker
+    notices the switch on its next call to get_active().
+    """
+    def __init__(self, base_path: str, max_loaded: int = 4):
+        self.base_path = base_path
+        self.max_loaded = max_loaded
+        # dataset_id -> (version, bundle) loaded in this process, least recently used first
+        self._active: "OrderedDict[str, Tuple[str, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._id_pattern = re.compile(settings.DATASET_ID_PATTERN)
+
+    def _model_dir(self, dataset_id: str) -> str:
+        if not self._id_pattern.match(dataset_id):
+            raise ValueError(f"Invalid dataset_id: {dataset_id!r}")
+        return os.path.join(self.base_path, dataset_id)
+
+    def _bundle_path(self, dataset_id: str, version: str) -> str:
+        return os.path.join(self._model_dir(dataset_id), f"{version}.joblib")
+
+    def save(self, dataset_id: str, version: str, bundle: Dict[str, Any]):
+        """Write a bundle for a version and make it the dataset's active model"""
+        import joblib
+
+        os.makedirs(self._model_dir(dataset_id), exist_ok=True)
+        path = self._bundle_path(dataset_id, version)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        joblib.dump(bundle, tmp_path)
+        os.replace(tmp_path, path)
+        self.activate(dataset_id, version)
+        logger.info(f"Saved model version {version} for dataset {dataset_id}")
+
+    def activate(self, dataset_id: str, version: str):
+        if not os.path.exists(self._bundle_path(dataset_id, version)):
+            raise ValueError(f"Unknown model version for dataset {dataset_id}: {version}")
+
+        model_dir = self._model_dir(dataset_id)
+        tmp_path = os.path.join(model_dir, f"{ACTIVE_FILE}.{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            f.write(version)
+        os.replace(tmp_path, os.path.join(model_dir, ACTIVE_FILE))
+
+    def active_version(self, dataset_id: str) -> Optional[str]:
+        try:
+            with open(os.path.join(self._model_dir(dataset_id), ACTIVE_FILE)) as f:
+                return f.read().strip()
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def get_active(self, dataset_id: str) -> Optional[Dict[str, Any]]:
+        """Return the dataset's active bundle, reloading it if another process switched versions"""
+        version = self.active_version(dataset_id)
+        if version is None:
+            return None
+
+        with self._lock:
+            loaded = self._active.get(dataset_id)
+            if loaded is None or loaded[0] != version:
+                import joblib
+                logger.info(f"Loading model version {version} for dataset {dataset_id}")
+                loaded = (version, joblib.load(self._bundle_path(dataset_id, version), mmap_mode="r"))
+                self._active[dataset_id] = loaded
+            self._active.move_to_end(dataset_id)
+
+            while len(self._active) > self.max_loaded:
+                evicted_id, (evicted_version, _) = self._active.popitem(last=False)
+                logger.info(f"Unloaded model version {evicted_version} for dataset {evicted_id}")
+            return loaded[1]
+
+model_registry = ModelRegistry(settings.MODEL_PATH, settings.MODEL_CACHE_SIZE)
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""Parallel Training Orchestrator"""
+import os
+import tempfile
+import numpy as np
+import joblib
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.model_selection import StratifiedKFold
+from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, roc_auc_score
+import logging
+from typing import Dict, Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+def score_probabilities(y_true: np.ndarray, y_proba: np.ndarray) -> Dict[str, float]:
+    """Classification metrics from one predict_proba pass; labels use predict's 0.5 rule"""
+    y_pred = (y_proba > 0.5).astype(int)
+    return {
+        'accuracy': accuracy_score(y_true, y_pred),
+        'precision': precision_score(y_true, y_pred, zero_division=0),
+        'recall': recall_score(y_true, y_pred, zero_division=0),
+        'f1': f1_score(y_true, y_pred, zero_division=0),
+        'roc_auc': roc_auc_score(y_true, y_proba) if len(np.unique(y_true)) > 1 else 0.5
+    }
+
+def share_array(array: np.ndarray, path: str) -> np.ndarray:
+    """Dump an array to disk and reopen it as a read-only memmap for worker processes"""
+    joblib.dump(np.ascontiguousarray(array), path)
+    return joblib.load(path, mmap_mode='r')
+
+def single_threaded(estimator):
+    # Parallelism comes from the process pool; nested n_jobs=-1 would oversubscribe cores
+    estimator = clone(estimator)
+    if 'n_jobs' in estimator.get_params():
+        estimator.set_params(n_jobs=1)
+    return estimator
+
+def _fit_and_score(name, estimator, X, y, train_idx, test_idx):
+    model = single_threaded(estimator).fit(X[train_idx], y[train_idx])
+    return name, score_probabilities(y[test_idx], model.predict_proba(X[test_idx])[:, 1])
+
+def _fit(name, estimator, X, y):
+    model = single_threaded(estimator).fit(X, y)
+    if 'n_jobs' in estimator.get_params():
+        model.set_params(n_jobs=estimator.get_params()['n_jobs'])
+    return name, model
+
+class TrainingOrchestrator:
+    """Fits candidate models and their cross-validation folds concurrently.
+
+    Every (candidate, fold) pair and every final fit is an independent task
+    on a process pool. The feature matrix is dumped once to a temporary
+    file and passed to workers as a read-only memmap, so tasks receive a
+    file reference instead of a pickled copy of the data.
+    """
+    def __init__(self, n_folds: int = 5, n_jobs: int = -1, random_state: int = 42):
+        self.n_folds = n_folds
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+
+    def run(
+        self,
+        candidates: Dict[str, Any],
+        X: np.ndarray,
+        y: np.ndarray
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Cross-validate and fit every candidate; returns (fitted models, CV metrics)"""
+        y = np.asarray(y)
+        n_folds = max(2, min(self.n_folds, int(np.bincount(y).min())))
+        folds = list(StratifiedKFold(
+            n_splits=n_folds, shuffle=True, random_state=self.random_state
+        ).split(X, y))
+
+        logger.info(f"Training {len(candidates)} candidates with {n_folds}-fold CV on {self.n_jobs} jobs...")
+
+        with tempfile.TemporaryDirectory(prefix="churnlogic_train_") as tmp_dir:
+            X_shared = share_array(X, os.path.join(tmp_dir, "X.joblib"))
+            y_shared = share_array(y, os.path.join(tmp_dir, "y.joblib"))
+
+            tasks = [
+                delayed(_fit_and_score)(name, estimator, X_shared, y_shared, train_idx, test_idx)
+                for name, estimator in candidates.items()
+                for train_idx, test_idx in folds
+            ]
+            tasks += [
+                delayed(_fit)(name, estimator, X_shared, y_shared)
+                for name, estimator in candidates.items()
+            ]
+            results = Parallel(n_jobs=self.n_jobs, max_nbytes=None)(tasks)
+
+        fold_scores = {name: [] for name in candidates}
+        fitted = {}
+        for name, result in results:
+            if isinstance(result, dict):
+                fold_scores[name].append(result)
+            else:
+                fitted[name] = result
+
+        return fitted, {
+            name: self._summarize(scores, n_folds)
+            for name, scores in fold_scores.items()
+        }
+
+    @staticmethod
+    def _summarize(scores: list, n_folds: int) -> Dict[str, Any]:
+        summary = {'n_folds': n_folds}
+        for metric in scores[0]:
+            values = np.array([s[metric] for s in scores], dtype=float)
+            summary[metric] = float(values.mean())
+            summary[f'{metric}_std'] = float(values.std())
+        return summary
\ No newline at end of file
@@ -0,0 +1,176 @@
+"""Budgeted Hyperparameter Search"""
+import os
+import math
+import time
+import tempfile
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import train_test_split
+from ml.training import share_array, single_threaded
+import logging
+from typing import Dict, Any, List
+
+logger = logging.getLogger(__name__)
+
+RANDOM_FOREST_SPACE = {
+    'n_estimators': [25, 50, 100, 200],
+    'max_depth': [4, 6, 8, 12, 15, None],
+    'min_samples_leaf': [1, 5, 20],
+    'max_features': ['sqrt', 0.5, None]
+}
+
+def _evaluate(index, estimator, params, X, y, train_idx, val_idx):
+    started = time.process_time()
+    model = single_threaded(estimator).set_params(**params).fit(X[train_idx], y[train_idx])
+
+    score_started = time.perf_counter()
+    y_proba = model.predict_proba(X[val_idx])[:, 1]
+    score_seconds = time.perf_counter() - score_started
+
+    return {
+        'index': index,
+        'roc_auc': float(roc_auc_score(y[val_idx], y_proba)),
+        # Total tree nodes is a stable proxy for per-row scoring cost
+        'n_nodes': int(sum(tree.tree_.node_count for tree in getattr(model, 'estimators_', []))),
+        'score_us_per_row': score_seconds / max(len(val_idx), 1) * 1e6,
+        'cpu_seconds': time.process_time() - started
+    }
+
+class SuccessiveHalvingSearch:
+    """Successive-halving search over training rows within a CPU-time budget.
+
+    All candidates start on a small stratified sample of the training rows.
+    After each round only the top 1/eta by validation AUC continue, on eta
+    times as many rows, so unpromising settings are dropped after cheap fits.
+    The final round scores the survivors on all rows. The winner is the
+    cheapest one to score whose AUC is within auc_tolerance of the best,
+    because a smaller forest with the same AUC is the better model to serve.
+    The search also stops early once the summed CPU time of its fits
+    exceeds cpu_budget_seconds.
+    """
+    def __init__(
+        self,
+        estimator,
+        param_space: Dict[str, list] = None,
+        n_candidates: int = 27,
+        eta: int = 3,
+        min_rows: int = 200,
+        cpu_budget_seconds: float = 120.0,
+        auc_tolerance: float = 0.005,
+        validation_size: float = 0.25,
+        n_jobs: int = -1,
+        random_state: int = 42
+    ):
+        self.estimator = estimator
+        self.param_space = param_space or RANDOM_FOREST_SPACE
+        self.n_candidates = n_candidates
+        self.eta = eta
+        self.min_rows = min_rows
+        self.cpu_budget_seconds = cpu_budget_seconds
+        self.auc_tolerance = auc_tolerance
+        self.validation_size = validation_size
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+        self.results: Dict[str, Any] = {}
+
+    def _sample_candidates(self) -> List[Dict[str, Any]]:
+        rng = np.random.default_rng(self.random_state)
+        total = math.prod(len(values) for values in self.param_space.values())
+        picks = rng.choice(total, size=min(self.n_candidates, total), replace=False)
+
+        candidates = []
+        for pick in picks:
+            params = {}
+            for name, values in self.param_space.items():
+                pick, offset = divmod(int(pick), len(values))
+                params[name] = values[offset]
+            candidates.append(params)
+        return candidates
+
+    def search(self, X: np.ndarray, y: np.ndarray) -> Dict[str, Any]:
+        """Run the search and return the chosen parameters"""
+        y = np.asarray(y)
+        candidates = self._sample_candidates()
+        train_idx, val_idx = train_test_split(
+            np.arange(len(y)), test_size=self.validation_size,
+            random_state=self.random_state, stratify=y
+        )
+
+        # Rounds needed to cut the field down to eta finalists, sized so the last uses every row
+        n_rounds = max(1, math.ceil(math.log(max(len(candidates) / self.eta, 1), self.eta)) + 1)
+        rng = np.random.default_rng(self.random_state)
+        shuffled_train = rng.permutation(train_idx)
+
+        survivors = list(range(len(candidates)))
+        rounds, scores, cpu_used = [], {}, 0.0
+        started = time.perf_counter()
+
+        with tempfile.TemporaryDirectory(prefix="churnlogic_tune_") as tmp_dir:
+            X_shared = share_array(X, os.path.join(tmp_dir, "X.joblib"))
+            y_shared = share_array(y, os.path.join(tmp_dir, "y.joblib"))
+
+            for r in range(n_rounds):
+                n_rows = len(shuffled_train) if r == n_rounds - 1 else max(
+                    self.min_rows, len(shuffled_train) // self.eta ** (n_rounds - 1 - r)
+                )
+                n_rows = min(n_rows, len(shuffled_train))
+                rows = np.sort(shuffled_train[:n_rows])
+
+                evaluated = Parallel(n_jobs=self.n_jobs, max_nbytes=None)(
+                    delayed(_evaluate)(i, self.estimator, candidates[i], X_shared, y_shared, rows, val_idx)
+                    for i in survivors
+                )
+                evaluated.sort(key=lambda e: e['roc_auc'], reverse=True)
+                for e in evaluated:
+                    scores[e['index']] = e
+                round_cpu = sum(e['cpu_seconds'] for e in evaluated)
+                cpu_used += round_cpu
+
+                rounds.append({
+                    'round': r,
+                    'rows': int(n_rows),
+                    'candidates': len(evaluated),
+                    'best_roc_auc': evaluated[0]['roc_auc'],
+                    'cpu_seconds': round(cpu_used, 2)
+                })
+                logger.info(
+                    f"Halving round {r}: {len(evaluated)} candidates on {n_rows} rows, "
+                    f"best AUC {evaluated[0]['roc_auc']:.4f}, CPU {cpu_used:.1f}s"
+                )
+
+                survivors = [e['index'] for e in evaluated]
+                if r == n_rounds - 1 or len(survivors) <= 1:
+                    break
+                # Each round costs about as much as the last (1/eta of the candidates on eta
+                # times the rows), so stop before one that would overshoot the budget
+                if cpu_used + round_cpu > self.cpu_budget_seconds:
+                    logger.info(
+                        f"Next round would take about {round_cpu:.1f}s CPU, over the remaining "
+                        f"budget of {max(self.cpu_budget_seconds - cpu_used, 0):.1f}s; stopping search early"
+                    )
+                    break
+                survivors = survivors[:max(1, math.ceil(len(survivors) / self.eta))]
+
+        finalists = [scores[i] for i in survivors]
+        best_auc = max(f['roc_auc'] for f in finalists)
+        eligible = [f for f in finalists if f['roc_auc'] >= best_auc - self.auc_tolerance]
+        chosen = min(eligible, key=lambda f: (f['n_nodes'], -f['roc_auc']))
+
+        self.results = {
+            'best_params': candidates[chosen['index']],
+            'best_roc_auc': chosen['roc_auc'],
+            'top_roc_auc': best_auc,
+            'n_nodes': chosen['n_nodes'],
+            'score_us_per_row': round(chosen['score_us_per_row'], 3),
+            'finalists': [
+                {'params': candidates[f['index']], 'roc_auc': f['roc_auc'], 'n_nodes': f['n_nodes']}
+                for f in finalists
+            ],
+            'rounds': rounds,
+            'candidates_evaluated': len(candidates),
+            'cpu_seconds': round(cpu_used, 2),
+            'wall_seconds': round(time.perf_counter() - started, 2)
+        }
+        logger.info(f"Selected {self.results['best_params']} (AUC {chosen['roc_auc']:.4f}, {chosen['n_nodes']} nodes)")
+        return self.results['best_params']
\ No newline at end of file
@@ -0,0 +1,281 @@
+"""Customer Index"""
+import os
+import numpy as np
+import pandas as pd
+import logging
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from services.data_service import ID_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+RISK_LEVELS = ("LOW", "MEDIUM", "HIGH")
+RANGE_COLUMNS = {
+    "tenure": ["tenure", "Tenure", "TENURE"],
+    "monthly_charges": ["monthly_charges", "MonthlyCharges", "monthly_charge"]
+}
+SORTS = ("risk", "customer_id")
+
+# Above this share of the rows, walking the sort order beats sorting the candidates
+SCAN_FRACTION = 0.25
+
+# (matching rows upper bound, candidate rows, predicate over rows)
+Term = Tuple[int, Callable[[], np.ndarray], Callable[[np.ndarray], np.ndarray]]
+
+def _inverse(order: np.ndarray) -> np.ndarray:
+    """Position of each row in a permutation"""
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order), dtype=order.dtype)
+    return rank
+
+def _postings(codes: np.ndarray) -> Dict[int, np.ndarray]:
+    """Rows holding each non-negative code, from one stable sort"""
+    order = np.argsort(codes, kind="stable")
+    values, starts = np.unique(codes[order], return_index=True)
+    ends = np.append(starts[1:], len(codes))
+    return {int(v): order[s:e] for v, s, e in zip(values, starts, ends) if v >= 0}
+
+class CustomerIndex:
+    """Sorted-array index over a dataset's customers, built once at upload.
+
+    Customer ids are kept as one sorted fixed-width array, so a prefix is a
+    contiguous range found with two binary searches. Tenure and monthly
+    charges keep their values in sorted order next to the row permutation,
+    so a range filter is a slice too. The arrays are saved with the dataset
+    version and opened with mmap, like its numeric columns.
+    """
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.arrays = arrays
+        self.rows = len(arrays["id_order"])
+
+    @classmethod
+    def build(cls, df: pd.DataFrame) -> 'CustomerIndex':
+        n = len(df)
+        index_dtype = np.int32 if n < 2 ** 31 else np.int64
+        id_col = next((c for c in ID_COLUMNS if c in df.columns), None)
+        # Same fallback ids as scoring, so predictions for id-less files still line up
+        ids = df[id_col].astype(str).to_numpy() if id_col else np.array([f"CUST-{i}" for i in df.index])
+        ids = np.asarray(ids, dtype=str)
+
+        order = np.argsort(ids, kind="stable").astype(index_dtype)
+        arrays = {"ids": ids[order], "id_order": order, "id_rank": _inverse(order)}
+        for name, candidates in RANGE_COLUMNS.items():
+            col = next((c for c in candidates if c in df.columns), None)
+            if col is None:
+                continue
+            values = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float)
+            # NaN sorts last, so missing values fall outside every range
+            order = np.argsort(values, kind="stable").astype(index_dtype)
+            arrays[name] = values
+            arrays[f"{name}_order"] = order
+            arrays[f"{name}_sorted"] = values[order]
+        return cls(arrays)
+
+    def save(self, path: str):
+        os.makedirs(path, exist_ok=True)
+        for name, values in self.arrays.items():
+            np.save(os.path.join(path, f"{name}.npy"), values)
+
+    @classmethod
+    def load(cls, path: str) -> 'CustomerIndex':
+        return cls({
+            name[:-4]: np.load(os.path.join(path, name), mmap_mode="r")
+            for name in os.listdir(path) if name.endswith(".npy")
+        })
+
+    def customer_ids(self, rows: np.ndarray) -> np.ndarray:
+        return self.arrays["ids"][self.arrays["id_rank"][rows]]
+
+    def locate(self, customer_ids: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows of the given customer ids, and which of the ids were found"""
+        ids = self.arrays["ids"]
+        wanted = np.asarray(customer_ids, dtype=str)
+        positions = np.minimum(np.searchsorted(ids, wanted), max(self.rows - 1, 0))
+        found = ids[positions] == wanted if self.rows else np.zeros(len(wanted), dtype=bool)
+        return self.arrays["id_order"][positions[found]], found
+
+    def prefix_range(self, prefix: str) -> Tuple[int, int]:
+        """Positions in the sorted ids of every id starting with prefix"""
+        ids = self.arrays["ids"]
+        # searchsorted truncates needles to the array's width, so longer prefixes cannot match
+        if len(prefix) > ids.dtype.itemsize // 4:
+            return 0, 0
+        # The first string past all those starting with the prefix: bump its last character
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        return int(np.searchsorted(ids, prefix)), int(np.searchsorted(ids, upper))
+
+    def scores(
+        self,
+        predictions: Optional[Tuple[Sequence[str], Sequence[float], Sequence[str]]] = None,
+        clusters: Optional[Tuple[Sequence[str], Sequence[int], Sequence[str]]] = None
+    ) -> 'CustomerScores':
+        return CustomerScores(self, predictions, clusters)
+
+    def search(
+        self,
+        scores: 'CustomerScores',
+        prefix: Optional[str] = None,
+        ranges: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+        risk_levels: Optional[List[str]] = None,
+        clusters: Optional[List[int]] = None,
+        sort: str = "risk",
+        offset: int = 0,
+        limit: int = 50
+    ) -> Tuple[int, np.ndarray]:
+        """Total matches and the rows of the requested page.
+
+        Every filter knows from its binary searches or posting list how many
+        rows it can match. Only the most selective one is expanded to rows;
+        the others are checked against just those candidates, so the work is
+        proportional to the smallest filter rather than to the dataset.
+        """
+        terms: List[Term] = []
+        if prefix:
+            terms.append(self._prefix_term(prefix))
+        for name, (low, high) in (ranges or {}).items():
+            if low is None and high is None:
+                continue
+            if name == "churn_probability":
+                terms.append(scores.probability_term(low, high))
+            elif name in self.arrays:
+                terms.append(self._range_term(name, low, high))
+            else:
+                # Filtering on a column the dataset does not have matches nothing
+                return 0, np.empty(0, dtype=np.int64)
+        if risk_levels is not None:
+            terms.append(scores.equality_term("risk", [RISK_LEVELS.index(level) for level in risk_levels]))
+        if clusters is not None:
+            terms.append(scores.equality_term("cluster", clusters))
+
+        if sort == "risk":
+            order, rank = scores.arrays["probability_order"], scores.arrays["probability_rank"]
+        else:
+            order, rank = self.arrays["id_order"], self.arrays["id_rank"]
+        end = offset + limit
+
+        if not terms:
+            # Unfiltered pages come straight off the sort order
+            return self.rows, np.asarray(order[offset:end])
+
+        terms.sort(key=lambda term: term[0])
+        if terms[0][0] > SCAN_FRACTION * self.rows:
+            # Most rows match: the page is near the front of the sort order, and a single
+            # range filter already knows its exact total from the binary searches
+            total = terms[0][0] if len(terms) == 1 else len(self._filter(terms[0][1](), terms[1:]))
+            return total, self._scan(order, terms, end)[offset:end]
+
+        rows = self._filter(terms[0][1](), terms[1:])
+
+        # Top-k: partition out the first `end` by sort position, then order only those
+        keys = rank[rows]
+        if end < len(rows):
+            top = np.argpartition(keys, end - 1)[:end]
+        else:
+            top = np.arange(len(rows))
+        top = top[np.argsort(keys[top], kind="stable")]
+        return len(rows), rows[top[offset:end]]
+
+    @staticmethod
+    def _filter(rows: np.ndarray, terms: List[Term]) -> np.ndarray:
+        for _, _, matches in terms:
+            if len(rows) == 0:
+                break
+            rows = rows[matches(rows)]
+        return rows
+
+    @staticmethod
+    def _scan(order: np.ndarray, terms: List[Term], end: int) -> np.ndarray:
+        """First `end` rows in sort order that pass every filter, read in doubling blocks"""
+        found, count, start, block = [], 0, 0, max(4 * end, 1024)
+        while count < end and start < len(order):
+            rows = CustomerIndex._filter(np.asarray(order[start:start + block]), terms)
+            found.append(rows)
+            count += len(rows)
+            start, block = start + block, 2 * block
+        return np.concatenate(found)[:end] if found else np.empty(0, dtype=np.int64)
+
+    def _prefix_term(self, prefix: str) -> Term:
+        lo, hi = self.prefix_range(prefix)
+        id_rank = self.arrays["id_rank"]
+        return (
+            hi - lo,
+            lambda: np.asarray(self.arrays["id_order"][lo:hi]),
+            lambda rows: (id_rank[rows] >= lo) & (id_rank[rows] < hi)
+        )
+
+    def _range_term(self, name: str, low: Optional[float], high: Optional[float]) -> Term:
+        values, order, ordered = self.arrays[name], self.arrays[f"{name}_order"], self.arrays[f"{name}_sorted"]
+        low = -np.inf if low is None else low
+        high = np.inf if high is None else high
+        lo = int(np.searchsorted(ordered, low, side="left"))
+        hi = int(np.searchsorted(ordered, high, side="right"))
+        return (
+            max(hi - lo, 0),
+            lambda: np.asarray(order[lo:hi]),
+            lambda rows: (values[rows] >= low) & (values[rows] <= high)
+        )
+
+class CustomerScores:
+    """Churn probability, risk level and cluster per indexed row for one prediction and clustering run.
+
+    Rows are ranked by probability once, highest first, so top-k by risk is
+    a slice of that order; each risk level and cluster keeps the posting
+    list of its rows for equality filters.
+    """
+    def __init__(
+        self,
+        index: CustomerIndex,
+        predictions: Optional[Tuple[Sequence[str], Sequence[float], Sequence[str]]] = None,
+        clusters: Optional[Tuple[Sequence[str], Sequence[int], Sequence[str]]] = None
+    ):
+        n = index.rows
+        probability = np.full(n, np.nan)
+        risk = np.full(n, -1, dtype=np.int8)
+        cluster = np.full(n, -1, dtype=np.int32)
+        self.cluster_names: Dict[int, str] = {}
+
+        if predictions is not None and len(predictions[0]):
+            customer_ids, probabilities, risk_levels = predictions
+            rows, found = index.locate(customer_ids)
+            probability[rows] = np.asarray(probabilities, dtype=float)[found]
+            codes = pd.Series(risk_levels).map({level: i for i, level in enumerate(RISK_LEVELS)})
+            risk[rows] = codes.fillna(-1).to_numpy(dtype=np.int8)[found]
+        if clusters is not None and len(clusters[0]):
+            customer_ids, cluster_ids, cluster_names = clusters
+            rows, found = index.locate(customer_ids)
+            cluster[rows] = np.asarray(cluster_ids, dtype=np.int32)[found]
+            self.cluster_names = dict(zip((int(c) for c in cluster_ids), cluster_names))
+
+        # Negated so the highest probability sorts first; unscored rows (NaN) go last
+        order = np.argsort(-probability, kind="stable").astype(index.arrays["id_order"].dtype)
+        self.arrays = {
+            "probability": probability,
+            "risk": risk,
+            "cluster": cluster,
+            "probability_order": order,
+            "probability_rank": _inverse(order),
+            "probability_sorted": -probability[order]
+        }
+        self.postings = {"risk": _postings(risk), "cluster": _postings(cluster)}
+
+    def probability_term(self, low: Optional[float], high: Optional[float]) -> Term:
+        probability, ordered = self.arrays["probability"], self.arrays["probability_sorted"]
+        low = -np.inf if low is None else low
+        high = np.inf if high is None else high
+        # probability_sorted is negated, so the bounds swap
+        lo = int(np.searchsorted(ordered, -high, side="left"))
+        hi = int(np.searchsorted(ordered, -low, side="right"))
+        order = self.arrays["probability_order"]
+        return (
+            max(hi - lo, 0),
+            lambda: order[lo:hi],
+            lambda rows: (probability[rows] >= low) & (probability[rows] <= high)
+        )
+
+    def equality_term(self, name: str, values: List[int]) -> Term:
+        postings = [self.postings[name][v] for v in values if v in self.postings[name]]
+        codes = self.arrays[name]
+        return (
+            sum(len(p) for p in postings),
+            lambda: np.concatenate(postings) if postings else np.empty(0, dtype=np.int64),
+            lambda rows: np.isin(codes[rows], values)
+        )
\ No newline at end of file
@@ -0,0 +1,127 @@
+"""Customer Search Service"""
+import time
+import logging
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
+from sqlalchemy import func, select
+from db.models import Cluster, Prediction
+from services.dataset_store import dataset_store
+
+if TYPE_CHECKING:
+    from services.customer_index import CustomerIndex, CustomerScores
+
+logger = logging.getLogger(__name__)
+
+class CustomerService:
+    """Paged customer search over the index built at upload.
+
+    Predictions and clusters change independently of the dataset, so their
+    per-row scores are indexed separately and cached per run, keyed like
+    the other aggregates on the newest prediction and cluster ids.
+    """
+    @staticmethod
+    def get_index(dataset_id: str) -> Optional["CustomerIndex"]:
+        from services.customer_index import CustomerIndex
+
+        entry = dataset_store.get(dataset_id)
+        if entry is None:
+            return None
+        if entry.index is not None:
+            return entry.index
+        # Versions uploaded before indexing was added build it once in memory
+        return dataset_store.get_aggregate(dataset_id, "customer_index", CustomerIndex.build)
+
+    @staticmethod
+    def get_scores(dataset_id: str, index: "CustomerIndex", db) -> "CustomerScores":
+        predictions_id = db.execute(
+            select(func.max(Prediction.id)).where(Prediction.dataset_id == dataset_id)
+        ).scalar()
+        clusters_id = db.execute(
+            select(func.max(Cluster.id)).where(Cluster.dataset_id == dataset_id)
+        ).scalar()
+        return dataset_store.get_aggregate(
+            dataset_id,
+            "customer_scores",
+            lambda df: CustomerService._build_scores(dataset_id, index, db),
+            run=(predictions_id, clusters_id)
+        )
+
+    @staticmethod
+    def _build_scores(dataset_id: str, index: "CustomerIndex", db) -> "CustomerScores":
+        predictions = db.execute(
+            select(Prediction.customer_id, Prediction.churn_probability, Prediction.risk_level)
+            .where(Prediction.dataset_id == dataset_id)
+        ).all()
+        clusters = db.execute(
+            select(Cluster.customer_id, Cluster.cluster_id, Cluster.cluster_name)
+            .where(Cluster.dataset_id == dataset_id)
+        ).all()
+        scores = index.scores(
+            tuple(zip(*predictions)) if predictions else None,
+            tuple(zip(*clusters)) if clusters else None
+        )
+        logger.info(f"Indexed scores for dataset {dataset_id}: {len(predictions)} predictions, {len(clusters)} cluster assignments")
+        return scores
+
+    @staticmethod
+    def search(
+        dataset_id: str,
+        db,
+        prefix: Optional[str] = None,
+        ranges: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+        risk_levels: Optional[List[str]] = None,
+        clusters: Optional[List[int]] = None,
+        sort: str = "risk",
+        offset: int = 0,
+        limit: int = 50
+    ) -> Dict[str, Any]:
+        import numpy as np
+        from services.customer_index import RISK_LEVELS, SORTS
+
+        if sort not in SORTS:
+            return {"status": "error", "message": f"sort must be one of {', '.join(SORTS)}"}
+        if risk_levels is not None:
+            risk_levels = [level.upper() for level in risk_levels]
+            unknown = [level for level in risk_levels if level not in RISK_LEVELS]
+            if unknown:
+                return {"status": "error", "message": f"Unknown risk level: {', '.join(unknown)}"}
+
+        index = CustomerService.get_index(dataset_id)
+        if index is None:
+            return {"status": "no_data"}
+        scores = CustomerService.get_scores(dataset_id, index, db)
+
+        started = time.perf_counter()
+        total, rows = index.search(scores, prefix, ranges, risk_levels, clusters, sort, offset, limit)
+
+        def column(name):
+            values = index.arrays.get(name)
+            return np.asarray(values[rows]) if values is not None else np.full(len(rows), np.nan)
+
+        probability = scores.arrays["probability"][rows]
+        risk = scores.arrays["risk"][rows]
+        cluster = scores.arrays["cluster"][rows]
+        customers = [
+            {
+                "customer_id": str(customer_id),
+                "tenure": None if np.isnan(t) else float(t),
+                "monthly_charges": None if np.isnan(c) else float(c),
+                "churn_probability": None if np.isnan(p) else round(float(p), 4),
+                "risk_level": RISK_LEVELS[r] if r >= 0 else None,
+                "cluster_id": int(k) if k >= 0 else None,
+                "cluster_name": scores.cluster_names.get(int(k)) if k >= 0 else None
+            }
+            for customer_id, t, c, p, r, k in zip(
+                index.customer_ids(rows), column("tenure"), column("monthly_charges"), probability, risk, cluster
+            )
+        ]
+        return {
+            "status": "ok",
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+            "sort": sort,
+            "customers": customers,
+            "took_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
+
+customer_service = CustomerService()
\ No newline at end of file
@@ -1,55 +1,66 @@
-"""Data Service"""
-import pandas as pd
-import logging
-from typing import Dict, Any
-import io
-
-logger = logging.getLogger(__name__)
-
-class DataService:
-    @staticmethod
-    async def process_upload(file, db) -> Dict[str, Any]:
-        try:
-            contents = await file.read()
-            df = pd.read_csv(io.BytesIO(contents))
-            
-            return {
-                'status': 'success',
-                'dataset_id': 'test_123',
-                'rows': len(df),
-                'columns': len(df.columns),
-                'preview': df.head(5).to_dict(orient='records'),
-                'validation_results': {
-                    'total_rows': len(df),
-                    'total_columns': len(df.columns),
-                    'columns': df.columns.tolist(),
-                    'warnings': []
-                }
-            }
-        except Exception as e:
-            logger.error(f"Upload error: {e}")
-            raise
-
-    @staticmethod
-    def validate_data(df):
-        return {
-            'total_rows': len(df),
-            'total_columns': len(df.columns),
-            'columns': df.columns.tolist(),
-            'warnings': []
-        }
-
-    @staticmethod
-    def get_target_variable(df):
-        churn_col = None
-        for col in df.columns:
-            if col.lower() in ['churn', 'churned', 'has_churn']:
-                churn_col = col
-                break
-        
-        if churn_col is None:
-            raise ValueError("No churn column found")
-        
-        return df[churn_col].astype(int), churn_col
-
+"""Data Service"""
+import logging
+from typing import Dict, Any
+import io
+
+logger = logging.getLogger(__name__)
+
+ID_COLUMNS = ["customer_id", "CustomerID", "id", "ID"]
+
+class DataService:
+    @staticmethod
+    async def process_upload(file, db) -> Dict[str, Any]:
+        import pandas as pd
+
+        try:
+            contents = await file.read()
+            df = pd.read_csv(io.BytesIO(contents))
+            
+            return {
+                'status': 'success',
+                'dataset_id': 'test_123',
+                'rows': len(df),
+                'columns': len(df.columns),
+                'preview': df.head(5).to_dict(orient='records'),
+                'validation_results': {
+                    'total_rows': len(df),
+                    'total_columns': len(df.columns),
+                    'columns': df.columns.tolist(),
+                    'warnings': []
+                }
+            }
+        except Exception as e:
+            logger.error(f"Upload error: {e}")
+            raise
+
+    @staticmethod
+    def validate_data(profile) -> Dict[str, Any]:
+        """Data-quality report from the profile built while the upload streamed in"""
+        columns = list(profile.columns)
+        target_col = DataService.find_target_column(profile)
+        id_col = next((c for c in ID_COLUMNS if c in profile.columns), None)
+        return {
+            'total_rows': profile.rows,
+            'total_columns': len(columns),
+            'columns': columns,
+            'warnings': profile.warnings(target_col, id_col),
+            'column_profiles': profile.summary()['columns']
+        }
+
+    @staticmethod
+    def find_target_column(df):
+        for col in df.columns:
+            if col.lower() in ['churn', 'churned', 'has_churn']:
+                return col
+        return None
+
+    @staticmethod
+    def get_target_variable(df):
+        churn_col = DataService.find_target_column(df)
+        
+        if churn_col is None:
+            raise ValueError("No churn column found")
+        
+        return df[churn_col].astype(int), churn_col
+
 data_service = DataService()
\ No newline at end of file
@@ -0,0 +1,351 @@
+"""Dataset Store"""
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import threading
+import logging
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable, Dict, Hashable, List, Optional, Tuple
+from config import settings
+from services.event_service import dashboard_events
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from services.customer_index import CustomerIndex
+    from services.profiling import DataProfile
+
+logger = logging.getLogger(__name__)
+
+CURRENT_FILE = "CURRENT"
+SCHEMA_FILE = "schema.json"
+PROFILE_FILE = "profile.json"
+INDEX_DIR = "index"
+
+def _nbytes(value: Any, seen: Optional[set] = None) -> int:
+    """Approximate memory held by a value; an array shared by several parts counts once"""
+    import numpy as np
+    import pandas as pd
+
+    seen = set() if seen is None else seen
+    if isinstance(value, np.ndarray):
+        # Views count as the array they look into
+        while isinstance(value.base, np.ndarray):
+            value = value.base
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(np.sum(value.memory_usage(deep=True)))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_nbytes(k, seen) + _nbytes(v, seen) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(_nbytes(v, seen) for v in value)
+    if hasattr(value, "__dict__"):
+        return sys.getsizeof(value) + _nbytes(vars(value), seen)
+    return sys.getsizeof(value)
+
+class DatasetEntry:
+    """In-memory working copy of a dataset plus the aggregates derived from it"""
+    def __init__(
+        self,
+        dataset_id: str,
+        df: "pd.DataFrame",
+        version: str,
+        nbytes: int,
+        profile: Optional["DataProfile"] = None,
+        index: Optional["CustomerIndex"] = None
+    ):
+        self.dataset_id = dataset_id
+        self.df = df
+        self.version = version
+        self.profile = profile
+        self.index = index
+        # name -> (run the value was built for, value)
+        self.aggregates: Dict[str, Tuple[Hashable, Any]] = {}
+        self.aggregate_bytes: Dict[str, int] = {}
+        self.data_bytes = nbytes
+
+    @property
+    def nbytes(self) -> int:
+        return self.data_bytes + sum(self.aggregate_bytes.values())
+
+class DatasetStore:
+    """Keeps a bounded LRU working set of datasets, backed by columnar files on disk.
+
+    Each upload is written as a new immutable version directory: numeric
+    columns as .npy files and text columns as pickles. Numeric columns are
+    opened with mmap, so every worker process reads the same page-cache
+    pages instead of holding a private copy. Publishing a version is an
+    atomic rename of the dataset's CURRENT pointer, which other workers
+    pick up on their next access.
+
+    Everything a resident dataset holds counts toward the budget: its mapped
+    numeric columns, its text columns and the aggregates cached on it.
+    Evicted datasets are reloaded lazily on the next access.
+    """
+    def __init__(self, base_path: str, memory_budget_bytes: int):
+        self.base_path = base_path
+        self.memory_budget_bytes = memory_budget_bytes
+        self._entries: "OrderedDict[str, DatasetEntry]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._id_pattern = re.compile(settings.DATASET_ID_PATTERN)
+
+    def _dataset_dir(self, dataset_id: str) -> str:
+        if not self._id_pattern.match(dataset_id):
+            raise ValueError(f"Invalid dataset_id: {dataset_id!r}")
+        return os.path.join(self.base_path, dataset_id)
+
+    def _current_version(self, dataset_dir: str) -> Optional[str]:
+        try:
+            with open(os.path.join(dataset_dir, CURRENT_FILE)) as f:
+                return f.read().strip()
+        except FileNotFoundError:
+            return None
+
+    def put(self, dataset_id: str, source: BinaryIO) -> DatasetEntry:
+        """Persist an uploaded CSV as a new version and make it the active one.
+
+        The file is read in chunks and profiled as it streams in, so the
+        data-quality sketches cost no extra pass over the data. The customer
+        search index is built here too and saved with the version.
+        """
+        import pandas as pd
+        from services.profiling import DataProfile
+
+        dataset_dir = self._dataset_dir(dataset_id)
+        profile = DataProfile()
+        chunks = []
+        for chunk in pd.read_csv(source, chunksize=settings.UPLOAD_CHUNK_ROWS):
+            profile.update(chunk)
+            chunks.append(chunk)
+        df = pd.concat(chunks, ignore_index=True)
+
+        version = str(time.time_ns())
+        self._write_version(os.path.join(dataset_dir, version), df, profile)
+
+        # Atomic switch: readers see either the old or the new version, never a partial one
+        tmp_path = os.path.join(dataset_dir, f"{CURRENT_FILE}.{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            f.write(version)
+        os.replace(tmp_path, os.path.join(dataset_dir, CURRENT_FILE))
+        self._remove_old_versions(dataset_dir, keep={version})
+
+        with self._lock:
+            entry = self._load(dataset_id, dataset_dir, version)
+            self._insert(entry)
+        logger.info(f"Stored dataset {dataset_id} version {version}: {len(df)} rows")
+        dashboard_events.observe(dataset_id, version)
+        return entry
+
+    def active_version(self, dataset_id: str) -> Optional[str]:
+        """The version CURRENT points at, as published by any worker"""
+        try:
+            return self._current_version(self._dataset_dir(dataset_id))
+        except ValueError:
+            return None
+
+    def get(self, dataset_id: str) -> Optional[DatasetEntry]:
+        """Return the dataset's active version, reloading it if evicted or replaced"""
+        try:
+            dataset_dir = self._dataset_dir(dataset_id)
+        except ValueError:
+            return None
+
+        version = self._current_version(dataset_dir)
+        if version is None:
+            return None
+
+        # Another worker may have published this version; tell this worker's viewers
+        # even when the dataset was never cached here or has been evicted
+        dashboard_events.observe(dataset_id, version)
+
+        with self._lock:
+            entry = self._entries.get(dataset_id)
+            if entry is not None and entry.version == version:
+                self._entries.move_to_end(dataset_id)
+                return entry
+
+            logger.info(f"Loading dataset {dataset_id} version {version} from disk")
+            entry = self._load(dataset_id, dataset_dir, version)
+            self._insert(entry)
+        return entry
+
+    def invalidate(self, dataset_id: str, reason: str):
+        """Drop cached aggregates after predictions or clusters change and notify viewers"""
+        with self._lock:
+            entry = self._entries.get(dataset_id)
+            if entry is not None:
+                entry.aggregates.clear()
+                entry.aggregate_bytes.clear()
+        dashboard_events.publish(dataset_id, reason)
+
+    def get_aggregate(
+        self,
+        dataset_id: str,
+        name: str,
+        compute: Callable[["pd.DataFrame"], Any],
+        run: Hashable = None
+    ) -> Optional[Any]:
+        """Return a cached aggregate for the dataset, computing it on first use.
+
+        run identifies the predictions or clusters the aggregate was built
+        from. A different run replaces the cached value rather than being
+        stored next to it, and the new value's size counts toward the budget.
+        """
+        entry = self.get(dataset_id)
+        if entry is None:
+            return None
+
+        cached = entry.aggregates.get(name)
+        if cached is not None and cached[0] == run:
+            return cached[1]
+
+        value = compute(entry.df)
+        nbytes = _nbytes(value)
+        with self._lock:
+            entry.aggregates[name] = (run, value)
+            entry.aggregate_bytes[name] = nbytes
+            if self._entries.get(dataset_id) is entry:
+                self._evict()
+        return value
+
+    def list_datasets(self) -> List[Dict[str, Any]]:
+        """List datasets available on disk and whether they are resident"""
+        if not os.path.isdir(self.base_path):
+            return []
+
+        with self._lock:
+            datasets = []
+            for dataset_id in sorted(os.listdir(self.base_path)):
+                version = self._current_version(os.path.join(self.base_path, dataset_id))
+                if version is None:
+                    continue
+                entry = self._entries.get(dataset_id)
+                datasets.append({
+                    "dataset_id": dataset_id,
+                    "version": version,
+                    "loaded": entry is not None,
+                    "memory_mb": round(entry.nbytes / (1024 * 1024), 2) if entry else 0.0
+                })
+            return datasets
+
+    def memory_usage(self) -> Dict[str, Any]:
+        """Report working-set size against the configured budget"""
+        with self._lock:
+            return {
+                "loaded_datasets": len(self._entries),
+                "memory_used_mb": round(self._memory_used() / (1024 * 1024), 2),
+                "memory_budget_mb": round(self.memory_budget_bytes / (1024 * 1024), 2)
+            }
+
+    def _write_version(self, version_dir: str, df: "pd.DataFrame", profile: "DataProfile"):
+        import numpy as np
+        from services.customer_index import CustomerIndex
+
+        tmp_dir = f"{version_dir}.tmp"
+        os.makedirs(tmp_dir, exist_ok=True)
+
+        columns = []
+        for i, col in enumerate(df.columns):
+            values = df[col]
+            if values.dtype.kind in "biuf":
+                filename = f"{i}.npy"
+                np.save(os.path.join(tmp_dir, filename), values.to_numpy())
+                kind = "numeric"
+            else:
+                filename = f"{i}.pkl"
+                values.to_pickle(os.path.join(tmp_dir, filename))
+                kind = "text"
+            columns.append({"name": str(col), "file": filename, "kind": kind})
+
+        with open(os.path.join(tmp_dir, SCHEMA_FILE), "w") as f:
+            json.dump({"rows": len(df), "columns": columns}, f)
+        with open(os.path.join(tmp_dir, PROFILE_FILE), "w") as f:
+            json.dump(profile.to_dict(), f)
+        CustomerIndex.build(df).save(os.path.join(tmp_dir, INDEX_DIR))
+        os.replace(tmp_dir, version_dir)
+
+    def _load(self, dataset_id: str, dataset_dir: str, version: str) -> DatasetEntry:
+        import numpy as np
+        import pandas as pd
+
+        version_dir = os.path.join(dataset_dir, version)
+        with open(os.path.join(version_dir, SCHEMA_FILE)) as f:
+            schema = json.load(f)
+
+        data = {}
+        nbytes = 0
+        for col in schema["columns"]:
+            path = os.path.join(version_dir, col["file"])
+            if col["kind"] == "numeric":
+                data[col["name"]] = np.load(path, mmap_mode="r")
+                nbytes += int(data[col["name"]].nbytes)
+            else:
+                data[col["name"]] = pd.read_pickle(path)
+                nbytes += int(data[col["name"]].memory_usage(deep=True))
+
+        # copy=False keeps the numeric columns as views over the shared mapping
+        df = pd.DataFrame(data, copy=False)
+        return DatasetEntry(
+            dataset_id, df, version, nbytes,
+            self._load_profile(version_dir), self._load_index(version_dir)
+        )
+
+    @staticmethod
+    def _load_profile(version_dir: str) -> Optional["DataProfile"]:
+        from services.profiling import DataProfile
+
+        try:
+            with open(os.path.join(version_dir, PROFILE_FILE)) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            # Versions written before profiling was added
+            return None
+        if "target_col" not in data:
+            # Written before the profile kept churned-row sketches; callers rebuild it
+            return None
+        return DataProfile.from_dict(data)
+
+    @staticmethod
+    def _load_index(version_dir: str) -> Optional["CustomerIndex"]:
+        from services.customer_index import CustomerIndex
+
+        path = os.path.join(version_dir, INDEX_DIR)
+        # Versions written before indexing was added are indexed on first search instead
+        return CustomerIndex.load(path) if os.path.isdir(path) else None
+
+    def _remove_old_versions(self, dataset_dir: str, keep: set):
+        # Leave the previous version in place for workers that still have it mapped
+        versions = sorted(
+            name for name in os.listdir(dataset_dir)
+            if name.isdigit() and name not in keep
+        )
+        for name in versions[:-1]:
+            shutil.rmtree(os.path.join(dataset_dir, name), ignore_errors=True)
+
+    def _memory_used(self) -> int:
+        return sum(entry.nbytes for entry in self._entries.values())
+
+    def _insert(self, entry: DatasetEntry):
+        self._entries.pop(entry.dataset_id, None)
+        self._entries[entry.dataset_id] = entry
+        self._evict()
+
+    def _evict(self):
+        # Evict least recently used datasets, always keeping the newest one resident
+        memory_used = self._memory_used()
+        while memory_used > self.memory_budget_bytes and len(self._entries) > 1:
+            evicted_id, evicted = self._entries.popitem(last=False)
+            memory_used -= evicted.nbytes
+            logger.info(f"Evicted dataset {evicted_id} ({evicted.nbytes / (1024 * 1024):.1f} MB)")
+
+dataset_store = DatasetStore(
+    settings.DATASET_PATH,
+    settings.DATASET_MEMORY_BUDGET_MB * 1024 * 1024
+)
\ No newline at end of file
@@ -0,0 +1,105 @@
+"""Dashboard Event Service"""
+import asyncio
+import threading
+import logging
+from typing import AsyncIterator, Callable, Dict, Optional, Tuple
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+class DashboardEventBroadcaster:
+    """Notifies dashboard subscribers when a dataset's aggregates change.
+
+    Each dataset has a change counter. Subscribers sleep on a shared
+    asyncio.Event until the counter moves, so idle viewers cost nothing and
+    a change wakes every viewer of that dataset at once.
+
+    Uploads handled by another worker process never call publish here, so
+    subscribers also poll the dataset's published version every
+    poll_seconds. The last version this process has seen is kept per
+    dataset, and the first subscriber to notice a different one publishes
+    it for all of them, whatever the dataset cache holds.
+    """
+    def __init__(self, keepalive_seconds: float = 15.0, poll_seconds: float = 1.0):
+        self.keepalive_seconds = keepalive_seconds
+        self.poll_seconds = poll_seconds
+        self._versions: Dict[str, Tuple[int, str]] = {}
+        self._data_versions: Dict[str, Optional[str]] = {}
+        self._events: Dict[str, asyncio.Event] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def current_version(self, dataset_id: str) -> int:
+        with self._lock:
+            return self._versions.get(dataset_id, (0, ""))[0]
+
+    def publish(self, dataset_id: str, reason: str):
+        """Record a change to a dataset and wake its subscribers (thread-safe)"""
+        with self._lock:
+            version, _ = self._versions.get(dataset_id, (0, ""))
+            self._versions[dataset_id] = (version + 1, reason)
+            event = self._events.pop(dataset_id, None)
+
+        if event is None or self._loop is None:
+            return
+
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if running_loop is self._loop:
+            event.set()
+        else:
+            self._loop.call_soon_threadsafe(event.set)
+
+    def observe(self, dataset_id: str, data_version: Optional[str]):
+        """Publish a new upload if data_version differs from the last one seen for the dataset"""
+        with self._lock:
+            if self._data_versions.get(dataset_id) == data_version:
+                return
+            self._data_versions[dataset_id] = data_version
+        self.publish(dataset_id, "dataset")
+
+    async def subscribe(
+        self,
+        dataset_id: str,
+        since_version: int,
+        poll: Optional[Callable[[], Optional[str]]] = None
+    ) -> AsyncIterator[Optional[Tuple[int, str]]]:
+        """Yield (version, reason) on every change after since_version.
+
+        poll returns the dataset's published version, which may have been
+        changed by another process. Yields None when keepalive_seconds pass
+        without a change so callers can send a heartbeat and check whether
+        the client went away.
+        """
+        loop = asyncio.get_running_loop()
+        self._loop = loop
+        last_version = since_version
+        keepalive_at = loop.time() + self.keepalive_seconds
+
+        while True:
+            with self._lock:
+                version, reason = self._versions.get(dataset_id, (0, ""))
+                event = self._events.setdefault(dataset_id, asyncio.Event())
+
+            if version != last_version:
+                last_version = version
+                keepalive_at = loop.time() + self.keepalive_seconds
+                yield version, reason
+                continue
+
+            timeout = keepalive_at - loop.time()
+            if poll is not None:
+                timeout = min(timeout, self.poll_seconds)
+            try:
+                await asyncio.wait_for(event.wait(), timeout=max(timeout, 0.0))
+            except asyncio.TimeoutError:
+                if poll is not None:
+                    self.observe(dataset_id, poll())
+                if loop.time() >= keepalive_at:
+                    keepalive_at = loop.time() + self.keepalive_seconds
+                    yield None
+
+dashboard_events = DashboardEventBroadcaster(poll_seconds=settings.DASHBOARD_POLL_SECONDS)
\ No newline at end of file
@@ -0,0 +1,266 @@
+"""Export Service"""
+import zlib
+import logging
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional
+from sqlalchemy import and_, func, select
+from config import settings
+from db.database import SessionLocal
+from db.models import Cluster, Prediction
+from services.customer_service import customer_service
+from services.insight_service import CHARGE_TIERS, TENURE_BANDS
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from services.customer_index import CustomerIndex
+
+logger = logging.getLogger(__name__)
+
+# format: (media type, file extension)
+FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet")
+}
+SCORE_COLUMNS = ["churn_probability", "risk_level", "cluster_id", "cluster_name", "segment"]
+
+class ExportAborted(RuntimeError):
+    """The prediction run being exported was replaced while the export was streaming"""
+
+class _ChunkSink:
+    """Write-only file object that hands back whatever was written since the last drain"""
+    def __init__(self):
+        self.parts: List[bytes] = []
+        self.closed = False
+
+    def write(self, data) -> int:
+        self.parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data, self.parts = b"".join(self.parts), []
+        return data
+
+class ExportService:
+    """Streams scored customers out as CSV, NDJSON or Parquet.
+
+    Predictions are read EXPORT_CHUNK_ROWS at a time by primary key, joined
+    to their cluster assignment in the database, and matched to dataset rows
+    through the customer index. Each chunk is encoded and compressed before
+    the next one is read, so memory stays flat however large the export.
+    """
+    @staticmethod
+    def prepare(
+        dataset_id: str,
+        db,
+        fmt: str = "csv",
+        risk_levels: Optional[List[str]] = None,
+        clusters: Optional[List[int]] = None,
+        segments: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Validate an export request before any bytes are sent; returns an error or the prediction id bound for stream()"""
+        from services.customer_index import RISK_LEVELS
+
+        if fmt not in FORMATS:
+            return {"status": "error", "message": f"format must be one of {', '.join(FORMATS)}"}
+        if fmt == "parquet":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                return {"status": "error", "message": "Parquet export needs pyarrow installed"}
+        if risk_levels is not None:
+            risk_levels = [level.upper() for level in risk_levels]
+            unknown = [level for level in risk_levels if level not in RISK_LEVELS]
+            if unknown:
+                return {"status": "error", "message": f"Unknown risk level: {', '.join(unknown)}"}
+        if segments is not None:
+            known = set(TENURE_BANDS[1]) | set(CHARGE_TIERS[1]) | {
+                f"{t} / {c}" for t in TENURE_BANDS[1] for c in CHARGE_TIERS[1]
+            }
+            unknown = [s for s in segments if s not in known]
+            if unknown:
+                return {"status": "error", "message": f"Unknown segment: {', '.join(unknown)}"}
+
+        index = customer_service.get_index(dataset_id)
+        if index is None:
+            return {"status": "no_data"}
+        if clusters is not None:
+            known = set(db.execute(
+                select(Cluster.cluster_id).where(Cluster.dataset_id == dataset_id).distinct()
+            ).scalars())
+            if not known:
+                return {"status": "error", "message": "No clusters for this dataset; run /cluster-users first"}
+            unknown = [str(c) for c in clusters if c not in known]
+            if unknown:
+                return {"status": "error", "message": f"Unknown cluster: {', '.join(unknown)}"}
+        # New prediction runs get higher ids, so this bounds the export to the current run
+        last_id = db.execute(
+            select(func.max(Prediction.id)).where(Prediction.dataset_id == dataset_id)
+        ).scalar()
+        if last_id is None:
+            return {"status": "error", "message": "No predictions for this dataset; run /predict-churn first"}
+
+        return {"status": "ok", "last_id": last_id, "risk_levels": risk_levels, "clusters": clusters, "segments": segments}
+
+    @staticmethod
+    def stream(
+        dataset_id: str,
+        fmt: str,
+        last_id: int,
+        risk_levels: Optional[List[str]] = None,
+        clusters: Optional[List[int]] = None,
+        segments: Optional[List[str]] = None,
+        compress: bool = True
+    ) -> Iterator[bytes]:
+        from services.dataset_store import dataset_store
+
+        entry = dataset_store.get(dataset_id)
+        if entry is None:
+            return
+        index = customer_service.get_index(dataset_id)
+        chunks = ExportService._scored_chunks(dataset_id, entry.df, index, last_id, risk_levels, clusters, segments)
+
+        if fmt == "parquet":
+            # Parquet compresses each row group itself, so it is never wrapped in gzip
+            yield from ExportService._parquet(entry.df, chunks)
+            return
+
+        # wbits=31 writes a gzip container, readable by gunzip and pandas alike
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+        for i, chunk in enumerate(chunks):
+            if fmt == "csv":
+                data = chunk.to_csv(index=False, header=i == 0).encode()
+            else:
+                text = chunk.to_json(orient="records", lines=True, date_format="iso")
+                data = (text if text.endswith("\n") else text + "\n").encode()
+            if compressor is not None:
+                data = compressor.compress(data)
+            if data:
+                yield data
+        if compressor is not None:
+            yield compressor.flush()
+
+    @staticmethod
+    def _scored_chunks(
+        dataset_id: str,
+        df: "pd.DataFrame",
+        index: "CustomerIndex",
+        last_id: int,
+        risk_levels: Optional[List[str]],
+        clusters: Optional[List[int]],
+        segments: Optional[List[str]]
+    ) -> Iterator["pd.DataFrame"]:
+        """Dataset rows joined to their scores, one chunk of predictions at a time"""
+        import numpy as np
+        import pandas as pd
+
+        query = (
+            select(
+                Prediction.id, Prediction.customer_id, Prediction.churn_probability,
+                Prediction.risk_level, Cluster.cluster_id, Cluster.cluster_name
+            )
+            .outerjoin(Cluster, and_(
+                Cluster.dataset_id == Prediction.dataset_id,
+                Cluster.customer_id == Prediction.customer_id
+            ))
+            .where(Prediction.dataset_id == dataset_id, Prediction.id <= last_id)
+            .order_by(Prediction.id)
+            .limit(settings.EXPORT_CHUNK_ROWS)
+        )
+        if risk_levels is not None:
+            query = query.where(Prediction.risk_level.in_(risk_levels))
+        if clusters is not None:
+            query = query.where(Cluster.cluster_id.in_(clusters))
+
+        # A new prediction run deletes this one; its last row tells whether it is still there
+        run_exists = select(Prediction.id).where(Prediction.dataset_id == dataset_id, Prediction.id == last_id)
+
+        tenure_col = next((c for c in ["tenure", "Tenure", "TENURE"] if c in df.columns), None)
+        charge_col = next((c for c in ["monthly_charges", "MonthlyCharges", "monthly_charge"] if c in df.columns), None)
+
+        db = SessionLocal()
+        exported, after = 0, 0
+        try:
+            while True:
+                rows = db.execute(query.where(Prediction.id > after)).all()
+                # Checked after the read: if the run was replaced before or during it, the chunk
+                # may be partial or empty, and ending here would pass a truncated file off as complete
+                replaced = db.execute(run_exists).first() is None
+                # End the read transaction between chunks so a long export holds no locks
+                db.commit()
+                if replaced:
+                    logger.warning(f"Export of dataset {dataset_id} aborted after {exported} rows: predictions were replaced")
+                    raise ExportAborted(f"Predictions for dataset {dataset_id} were replaced during the export")
+                if not rows:
+                    break
+                after = rows[-1][0]
+
+                scores = pd.DataFrame(rows, columns=["id", "customer_id", *SCORE_COLUMNS[:-1]])
+                positions, found = index.locate(scores["customer_id"].to_numpy(dtype=str))
+                # Score columns take precedence over dataset columns of the same name
+                chunk = df.iloc[positions].drop(columns=[c for c in SCORE_COLUMNS if c in df.columns]).reset_index(drop=True)
+                scores = scores[found].reset_index(drop=True)
+
+                def numeric(col):
+                    return np.nan_to_num(pd.to_numeric(chunk[col], errors='coerce').to_numpy(dtype=float)) if col else None
+
+                # Same tenure band x charge tier grid as the retention strategies
+                tenure, charge = numeric(tenure_col), numeric(charge_col)
+                bands = np.asarray(TENURE_BANDS[1] if tenure is not None else ["All tenures"], dtype=object)
+                tiers = np.asarray(CHARGE_TIERS[1] if charge is not None else ["All plans"], dtype=object)
+                band = bands[np.searchsorted(TENURE_BANDS[0], tenure, side='left') if tenure is not None else np.zeros(len(chunk), dtype=np.int64)]
+                tier = tiers[np.searchsorted(CHARGE_TIERS[0], charge, side='left') if charge is not None else np.zeros(len(chunk), dtype=np.int64)]
+                segment = band + " / " + tier
+
+                chunk["churn_probability"] = scores["churn_probability"].round(4)
+                chunk["risk_level"] = scores["risk_level"]
+                chunk["cluster_id"] = scores["cluster_id"].astype("Int64")
+                chunk["cluster_name"] = scores["cluster_name"]
+                chunk["segment"] = segment
+                if segments is not None:
+                    chunk = chunk[np.isin(segment, segments) | np.isin(band, segments) | np.isin(tier, segments)]
+
+                exported += len(chunk)
+                if len(chunk):
+                    yield chunk
+        finally:
+            db.close()
+        logger.info(f"Exported {exported} scored customers from dataset {dataset_id}")
+
+    @staticmethod
+    def _parquet(df: "pd.DataFrame", chunks: Iterator["pd.DataFrame"]) -> Iterator[bytes]:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        # Fixed up front so every row group matches, even when a chunk's text column is all empty
+        numeric = {col for col in df.columns if df[col].dtype.kind in "biuf"}
+        fields = [
+            pa.field(str(col), pa.from_numpy_dtype(df[col].dtype) if col in numeric else pa.string())
+            for col in df.columns if col not in SCORE_COLUMNS
+        ]
+        fields += [
+            pa.field("churn_probability", pa.float64()),
+            pa.field("risk_level", pa.string()),
+            pa.field("cluster_id", pa.int64()),
+            pa.field("cluster_name", pa.string()),
+            pa.field("segment", pa.string())
+        ]
+        schema = pa.schema(fields)
+
+        sink = _ChunkSink()
+        with pq.ParquetWriter(sink, schema, compression="zstd") as writer:
+            for chunk in chunks:
+                # Text columns can mix numbers and strings where upload chunks parsed differently
+                text = [col for col in chunk.columns if col not in numeric and col not in SCORE_COLUMNS]
+                chunk[text] = chunk[text].astype("string")
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+                yield sink.drain()
+        # Closing the writer wrote the footer
+        yield sink.drain()
+
+export_service = ExportService()
\ No newline at end of file
@@ -1,87 +1,439 @@
-"""Insight Service"""
-import logging
-from typing import Dict, Any, List
-
-logger = logging.getLogger(__name__)
-
-class InsightService:
-    @staticmethod
-    def generate_insights(db) -> List[Dict[str, Any]]:
-        return [
-            {
-                "title": "Critical Churn Risk",
-                "description": "25.5% of customers are at high churn risk. Immediate intervention required.",
-                "priority": "high",
-                "impact": "255 customers",
-                "confidence": 0.95,
-                "recommendation": "Deploy targeted retention campaigns"
-            },
-            {
-                "title": "New Customer Onboarding",
-                "description": "Focus on onboarding quality for new customers.",
-                "priority": "medium",
-                "impact": "50 customers",
-                "confidence": 0.90,
-                "recommendation": "Enhance onboarding experience"
-            }
-        ]
-    
-    @staticmethod
-    def generate_strategies(db) -> List[Dict[str, Any]]:
-        return [
-            {
-                "title": "VIP Retention Program",
-                "description": "Personalized outreach and exclusive offers for high-value customers at risk of churning.",
-                "target_segment": "High-Value At-Risk",
-                "expected_impact": 0.15,
-                "priority": "high",
-                "tags": ["retention", "vip", "personalization"],
-                "actions": [
-                    "Send personalized retention offer",
-                    "Assign dedicated account manager",
-                    "Offer exclusive loyalty rewards"
-                ]
-            },
-            {
-                "title": "Win-Back Campaign",
-                "description": "Target recently churned customers with special re-engagement offers.",
-                "target_segment": "Churned Recently",
-                "expected_impact": 0.08,
-                "priority": "medium",
-                "tags": ["retention", "reactivation"],
-                "actions": [
-                    "Identify churned customers",
-                    "Send personalized win-back offer",
-                    "Highlight product improvements"
-                ]
-            },
-            {
-                "title": "Engagement Acceleration",
-                "description": "Increase product engagement through targeted feature education.",
-                "target_segment": "Low Engagement",
-                "expected_impact": 0.12,
-                "priority": "medium",
-                "tags": ["engagement", "education"],
-                "actions": [
-                    "Send feature highlight emails",
-                    "Offer free training sessions",
-                    "Provide personalized recommendations"
-                ]
-            }
-        ]
-    
-    @staticmethod
-    def get_customer_insights(customer_id: str, db) -> Dict[str, Any]:
-        return {
-            "customer_id": customer_id,
-            "churn_probability": 0.65,
-            "risk_level": "HIGH",
-            "segment": "Premium Loyalists",
-            "recommendations": [
-                "Send immediate retention offer",
-                "Schedule call with account manager",
-                "Offer exclusive loyalty rewards"
-            ]
-        }
-
+"""Insight Service"""
+import logging
+from typing import TYPE_CHECKING, Dict, Any, List, Optional
+from sqlalchemy import delete, func, insert, select
+from config import settings
+from db.models import CampaignRecommendation, Cluster, Prediction
+from services.data_service import data_service, ID_COLUMNS
+from services.dataset_store import dataset_store
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Segment grid: tenure bands x monthly charge tiers, matching the dashboard's bands
+TENURE_BANDS = ([6, 12, 24], ["New (0-6m)", "Growing (6-12m)", "Established (1-2y)", "Loyal (2y+)"])
+CHARGE_TIERS = ([40, 70, 90], ["Budget ($0-40)", "Standard ($40-70)", "Premium ($70-90)", "Enterprise ($90+)"])
+
+# Candidate interventions. uplift is the share of expected churners an intervention
+# retains; each contacted customer costs flat_cost plus discount x monthly charge for
+# discount_months. Empty tenure_bands/charge_tiers mean every band or tier is eligible.
+INTERVENTIONS = [
+    {
+        "title": "Targeted Discount Campaign",
+        "uplift": 0.30, "flat_cost": 5.0, "discount": 0.15, "discount_months": 3,
+        "tenure_bands": [], "charge_tiers": [],
+        "tags": ["retention", "discount"],
+        "actions": ["Send a time-limited 15% discount offer", "Follow up before the next billing date"]
+    },
+    {
+        "title": "Proactive Support Outreach",
+        "uplift": 0.20, "flat_cost": 15.0, "discount": 0.0, "discount_months": 0,
+        "tenure_bands": [], "charge_tiers": [],
+        "tags": ["retention", "support"],
+        "actions": ["Schedule a check-in call", "Resolve open support tickets first"]
+    },
+    {
+        "title": "Onboarding Improvement",
+        "uplift": 0.35, "flat_cost": 25.0, "discount": 0.0, "discount_months": 0,
+        "tenure_bands": [0, 1], "charge_tiers": [],
+        "tags": ["onboarding", "engagement"],
+        "actions": ["Assign an onboarding specialist", "Send a guided setup sequence"]
+    },
+    {
+        "title": "Loyalty Rewards Program",
+        "uplift": 0.15, "flat_cost": 5.0, "discount": 0.05, "discount_months": 12,
+        "tenure_bands": [2, 3], "charge_tiers": [],
+        "tags": ["loyalty", "rewards"],
+        "actions": ["Enroll in loyalty points", "Offer an anniversary reward"]
+    },
+    {
+        "title": "VIP Retention Program",
+        "uplift": 0.40, "flat_cost": 60.0, "discount": 0.10, "discount_months": 6,
+        "tenure_bands": [], "charge_tiers": [2, 3],
+        "tags": ["retention", "vip", "personalization"],
+        "actions": ["Assign a dedicated account manager", "Offer an exclusive plan upgrade"]
+    },
+    {
+        "title": "Plan Right-Sizing Offer",
+        "uplift": 0.25, "flat_cost": 10.0, "discount": 0.0, "discount_months": 0,
+        "tenure_bands": [], "charge_tiers": [0, 1],
+        "tags": ["pricing", "retention"],
+        "actions": ["Recommend a better-fitting plan", "Highlight unused features included in the plan"]
+    },
+]
+
+class InsightService:
+    """Insights and ranked retention strategies from cached per-segment aggregates.
+
+    The customer table is scanned once per dataset version and prediction
+    run to build the segment and cluster aggregates. Every insight and
+    ranking after that works on those few rows only.
+    """
+    @staticmethod
+    def get_aggregates(dataset_id: str, db) -> Optional[Dict[str, Any]]:
+        # Prediction and cluster rows are replaced wholesale, so their newest ids identify the
+        # current run; keying on them keeps every worker's cache in step without a rescan
+        predictions_id = db.execute(
+            select(func.max(Prediction.id)).where(Prediction.dataset_id == dataset_id)
+        ).scalar()
+        clusters_id = db.execute(
+            select(func.max(Cluster.id)).where(Cluster.dataset_id == dataset_id)
+        ).scalar()
+        return dataset_store.get_aggregate(
+            dataset_id,
+            "retention_segments",
+            lambda df: InsightService._build_aggregates(dataset_id, df, db),
+            run=(predictions_id, clusters_id)
+        )
+
+    @staticmethod
+    def _build_aggregates(dataset_id: str, df: "pd.DataFrame", db) -> Dict[str, Any]:
+        import numpy as np
+        import pandas as pd
+
+        def numeric(candidates):
+            col = next((c for c in candidates if c in df.columns), None)
+            return pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=float) if col else None
+
+        n = len(df)
+        tenure = numeric(["tenure", "Tenure", "TENURE"])
+        charge = numeric(["monthly_charges", "MonthlyCharges", "monthly_charge"])
+        churn_col = data_service.find_target_column(df)
+        churn = np.nan_to_num(pd.to_numeric(df[churn_col], errors='coerce').to_numpy(dtype=float)) if churn_col else None
+
+        tenure_idx = np.searchsorted(TENURE_BANDS[0], np.nan_to_num(tenure), side='left') if tenure is not None else np.zeros(n, dtype=np.int64)
+        tier_idx = np.searchsorted(CHARGE_TIERS[0], np.nan_to_num(charge), side='left') if charge is not None else np.zeros(n, dtype=np.int64)
+        tenure_labels = TENURE_BANDS[1] if tenure is not None else ["All tenures"]
+        tier_labels = CHARGE_TIERS[1] if charge is not None else ["All plans"]
+        has_charge = charge is not None
+        if not has_charge:
+            # Without charges, spread the configured customer value over the horizon
+            charge = np.full(n, settings.RETENTION_CUSTOMER_VALUE / settings.RETENTION_HORIZON_MONTHS)
+        charge = np.where(np.isnan(charge), np.nanmedian(charge) if n else 0.0, charge)
+
+        # Per-customer churn probability and targeting from the latest predictions, if any
+        id_col = next((c for c in ID_COLUMNS if c in df.columns), None)
+        rows = db.execute(
+            select(Prediction.customer_id, Prediction.churn_probability, Prediction.risk_level)
+            .where(Prediction.dataset_id == dataset_id)
+        ).all()
+        has_predictions = bool(rows) and id_col is not None
+        if has_predictions:
+            predictions = pd.DataFrame(rows, columns=["customer_id", "probability", "risk_level"]).drop_duplicates("customer_id")
+            predictions = predictions.set_index("customer_id")
+            ids = df[id_col].astype(str)
+            probability = ids.map(predictions["probability"]).to_numpy(dtype=float)
+            risk = ids.map(predictions["risk_level"]).to_numpy(dtype=object)
+            targeted = (risk == "HIGH") | (risk == "MEDIUM")
+            high = risk == "HIGH"
+            probability = np.nan_to_num(probability)
+        else:
+            # Fall back to observed churn: every customer is contacted, churners are the risk
+            probability = churn if churn is not None else np.zeros(n)
+            targeted = np.ones(n, dtype=bool)
+            high = probability >= 0.5
+
+        n_tiers = len(tier_labels)
+        n_segments = len(tenure_labels) * n_tiers
+        code = tenure_idx * n_tiers + tier_idx
+
+        def per_segment(weights=None):
+            return np.bincount(code, weights=weights, minlength=n_segments).astype(float)
+
+        segments = {
+            "labels": [f"{t} / {c}" for t in tenure_labels for c in tier_labels],
+            "tenure_idx": np.repeat(np.arange(len(tenure_labels)), n_tiers),
+            "tier_idx": np.tile(np.arange(n_tiers), len(tenure_labels)),
+            "has_tenure": tenure is not None,
+            "has_charge": has_charge,
+            "count": per_segment(),
+            "churned": per_segment(churn) if churn is not None else None,
+            "probability_sum": per_segment(probability),
+            "targeted": per_segment(targeted.astype(float)),
+            "targeted_charge": per_segment(charge * targeted),
+            "expected_churners": per_segment(probability * targeted),
+            "revenue_at_risk": per_segment(probability * charge * targeted),
+            "high_risk": per_segment(high.astype(float))
+        }
+
+        clusters = []
+        cluster_rows = db.execute(
+            select(Cluster.customer_id, Cluster.cluster_id, Cluster.cluster_name)
+            .where(Cluster.dataset_id == dataset_id)
+        ).all()
+        if cluster_rows and id_col is not None:
+            assigned = pd.DataFrame(cluster_rows, columns=["customer_id", "cluster_id", "cluster_name"]).drop_duplicates("customer_id")
+            cluster_ids = df[id_col].astype(str).map(assigned.set_index("customer_id")["cluster_id"])
+            known = cluster_ids.notna().to_numpy()
+            cluster_ids = cluster_ids[known].to_numpy(dtype=np.int64)
+            names = dict(zip(assigned["cluster_id"], assigned["cluster_name"]))
+            sizes = np.bincount(cluster_ids)
+            prob_sums = np.bincount(cluster_ids, weights=probability[known])
+            risk_sums = np.bincount(cluster_ids, weights=(probability * charge)[known])
+            for cid in np.flatnonzero(sizes):
+                clusters.append({
+                    "cluster_id": int(cid),
+                    "name": names.get(cid, f"Cluster {cid}"),
+                    "size": int(sizes[cid]),
+                    "avg_probability": float(prob_sums[cid] / sizes[cid]),
+                    "revenue_at_risk": float(risk_sums[cid])
+                })
+
+        logger.info(f"Built retention aggregates for dataset {dataset_id}: {n_segments} segments, {len(clusters)} clusters")
+        return {
+            "total_customers": n,
+            "churned": float(churn.sum()) if churn is not None else None,
+            "has_predictions": has_predictions,
+            "risk_distribution": {
+                level: int((risk == level).sum()) for level in ("HIGH", "MEDIUM", "LOW")
+            } if has_predictions else None,
+            "segments": segments,
+            "clusters": clusters
+        }
+
+    @staticmethod
+    def rank_interventions(aggregates: Dict[str, Any], limit: int = 6) -> List[Dict[str, Any]]:
+        """Best intervention per segment, ranked by expected retained revenue net of cost"""
+        import numpy as np
+
+        seg = aggregates["segments"]
+        horizon = settings.RETENTION_HORIZON_MONTHS
+        uplift = np.array([i["uplift"] for i in INTERVENTIONS])
+        flat_cost = np.array([i["flat_cost"] for i in INTERVENTIONS])
+        discount_cost = np.array([i["discount"] * i["discount_months"] for i in INTERVENTIONS])
+
+        # interventions x segments, all at once
+        retained = uplift[:, None] * seg["revenue_at_risk"][None, :] * horizon
+        cost = flat_cost[:, None] * seg["targeted"][None, :] + discount_cost[:, None] * seg["targeted_charge"][None, :]
+        every = np.ones(len(seg["labels"]), dtype=bool)
+        # Band- or tier-specific interventions need the column they are defined on
+        eligible = np.array([
+            (np.isin(seg["tenure_idx"], i["tenure_bands"]) & seg["has_tenure"] if i["tenure_bands"] else every)
+            & (np.isin(seg["tier_idx"], i["charge_tiers"]) & seg["has_charge"] if i["charge_tiers"] else every)
+            for i in INTERVENTIONS
+        ])
+        net = np.where(eligible, retained - cost, -np.inf)
+
+        best = np.argmax(net, axis=0)
+        segment_idx = np.arange(net.shape[1])
+        best_net = net[best, segment_idx]
+        order = [s for s in np.argsort(-best_net) if best_net[s] > 0 and seg["targeted"][s] > 0][:limit]
+
+        audience = "at-risk customers" if aggregates["has_predictions"] else "customers"
+        strategies = []
+        for s in order:
+            i = best[s]
+            intervention = INTERVENTIONS[i]
+            roi = best_net[s] / cost[i, s] if cost[i, s] > 0 else float("inf")
+            saves = intervention["uplift"] * seg["expected_churners"][s]
+            strategies.append({
+                "title": intervention["title"],
+                "description": (
+                    f"Contact {int(seg['targeted'][s])} {audience} in {seg['labels'][s]}. "
+                    f"Expected to retain about {saves:.0f} of them and ${retained[i, s]:,.0f} "
+                    f"in revenue over {horizon} months for ${cost[i, s]:,.0f}."
+                ),
+                "target_segment": seg["labels"][s],
+                "expected_impact": round(float(best_net[s]), 2),
+                "priority": "high" if roi >= 3 else "medium" if roi >= 1 else "low",
+                "tags": intervention["tags"],
+                "actions": intervention["actions"],
+                "details": {
+                    "customers_targeted": int(seg["targeted"][s]),
+                    "expected_saves": round(float(saves), 1),
+                    "retained_revenue": round(float(retained[i, s]), 2),
+                    "cost": round(float(cost[i, s]), 2),
+                    "roi": round(float(roi), 2) if np.isfinite(roi) else None
+                }
+            })
+        return strategies
+
+    @staticmethod
+    def generate_strategies(dataset_id: str, db, limit: int = 6) -> List[Dict[str, Any]]:
+        """Rank interventions for the dataset and save them as its campaign recommendations"""
+        aggregates = InsightService.get_aggregates(dataset_id, db)
+        if aggregates is None:
+            return []
+        strategies = InsightService.rank_interventions(aggregates, limit)
+
+        db.execute(delete(CampaignRecommendation).where(CampaignRecommendation.dataset_id == dataset_id))
+        if strategies:
+            db.execute(insert(CampaignRecommendation), [
+                {
+                    "dataset_id": dataset_id,
+                    "title": s["title"],
+                    "description": s["description"],
+                    "target_segment": s["target_segment"],
+                    "expected_impact": s["expected_impact"],
+                    "priority": s["priority"],
+                    "tags": s["tags"],
+                    "details": {**s["details"], "actions": s["actions"]}
+                }
+                for s in strategies
+            ])
+        db.commit()
+        return strategies
+
+    @staticmethod
+    def get_saved_strategies(dataset_id: str, db) -> Dict[str, Any]:
+        """The dataset's saved campaign recommendations, as generate_strategies returned them"""
+        rows = db.execute(
+            select(CampaignRecommendation)
+            .where(CampaignRecommendation.dataset_id == dataset_id)
+            .order_by(CampaignRecommendation.id)
+        ).scalars().all()
+        strategies = []
+        for r in rows:
+            details = dict(r.details or {})
+            actions = details.pop("actions", [])
+            strategies.append({
+                "title": r.title,
+                "description": r.description,
+                "target_segment": r.target_segment,
+                "expected_impact": r.expected_impact,
+                "priority": r.priority,
+                "tags": r.tags or [],
+                "actions": actions,
+                "details": details
+            })
+        return {
+            "strategies": strategies,
+            "generated_at": rows[0].created_at.isoformat() if rows else None
+        }
+
+    @staticmethod
+    def generate_insights(dataset_id: str, db) -> List[Dict[str, Any]]:
+        import numpy as np
+
+        aggregates = InsightService.get_aggregates(dataset_id, db)
+        if aggregates is None or aggregates["total_customers"] == 0:
+            return []
+
+        seg = aggregates["segments"]
+        total = aggregates["total_customers"]
+        horizon = settings.RETENTION_HORIZON_MONTHS
+        insights = []
+
+        def confidence(n):
+            # Grows with the number of customers behind the insight
+            return round(float(1 - 1 / np.sqrt(max(n, 1))), 2)
+
+        if aggregates["churned"] is not None:
+            churned = aggregates["churned"]
+            rate = churned / total * 100
+            insights.append({
+                "title": "Churn Rate Alert" if rate > 10 else "Healthy Churn Rate",
+                "description": f"{rate:.1f}% of customers ({int(churned)} of {total}) have churned.",
+                "priority": "high" if rate > 20 else "medium" if rate > 10 else "low",
+                "impact": f"{int(churned)} customers",
+                "confidence": confidence(total),
+                "recommendation": "Deploy targeted retention campaigns" if rate > 10 else "Keep monitoring churn by segment"
+            })
+
+            # Riskiest segment among those large enough to act on
+            sizable = seg["count"] >= max(10, 0.01 * total)
+            rates = np.divide(seg["churned"], seg["count"], out=np.zeros_like(seg["count"]), where=seg["count"] > 0)
+            if sizable.any() and churned > 0:
+                s = int(np.argmax(np.where(sizable, rates, -1)))
+                lift = rates[s] / (churned / total)
+                insights.append({
+                    "title": "Highest-Risk Segment",
+                    "description": (
+                        f"{seg['labels'][s]} customers churn at {rates[s] * 100:.1f}%, "
+                        f"{lift:.1f}x the overall rate."
+                    ),
+                    "priority": "high" if lift >= 1.5 else "medium",
+                    "impact": f"{int(seg['count'][s])} customers",
+                    "confidence": confidence(seg["count"][s]),
+                    "recommendation": f"Prioritize retention offers for {seg['labels'][s]}"
+                })
+
+            # Early-life versus long-tenure churn
+            n_tiers = int(seg["tier_idx"].max()) + 1
+            band_count = seg["count"].reshape(-1, n_tiers).sum(axis=1)
+            band_churned = seg["churned"].reshape(-1, n_tiers).sum(axis=1)
+            if len(band_count) > 1 and band_count[0] > 0 and band_count[-1] > 0 and band_churned[-1] > 0:
+                new_rate, loyal_rate = band_churned[0] / band_count[0], band_churned[-1] / band_count[-1]
+                if new_rate > loyal_rate * 1.2:
+                    insights.append({
+                        "title": "New Customer Onboarding",
+                        "description": (
+                            f"New customers churn at {new_rate * 100:.1f}% versus {loyal_rate * 100:.1f}% "
+                            f"for loyal customers ({new_rate / loyal_rate:.1f}x)."
+                        ),
+                        "priority": "high" if new_rate > loyal_rate * 2 else "medium",
+                        "impact": f"{int(band_count[0])} customers",
+                        "confidence": confidence(band_count[0]),
+                        "recommendation": "Enhance onboarding in the first six months"
+                    })
+
+        if aggregates["has_predictions"]:
+            distribution = aggregates["risk_distribution"]
+            at_risk = seg["revenue_at_risk"].sum()
+            insights.append({
+                "title": "Critical Churn Risk" if distribution["HIGH"] else "Predicted Churn Risk",
+                "description": (
+                    f"{distribution['HIGH'] / total * 100:.1f}% of customers are at high churn risk "
+                    f"and {distribution['MEDIUM'] / total * 100:.1f}% at medium risk. "
+                    f"${at_risk:,.0f} of monthly revenue is expected to churn without intervention."
+                ),
+                "priority": "high" if distribution["HIGH"] / total > 0.1 else "medium",
+                "impact": f"{distribution['HIGH']} customers",
+                "confidence": confidence(total),
+                "recommendation": "Target high and medium risk customers first"
+            })
+        else:
+            insights.append({
+                "title": "Predictions Not Run",
+                "description": "Insights are based on historical churn only. Run churn prediction for customer-level risk.",
+                "priority": "low",
+                "impact": f"{total} customers",
+                "confidence": confidence(total),
+                "recommendation": "Train a model and run churn prediction"
+            })
+
+        if aggregates["clusters"]:
+            riskiest = max(aggregates["clusters"], key=lambda c: c["avg_probability"])
+            insights.append({
+                "title": f"Riskiest Cluster: {riskiest['name']}",
+                "description": (
+                    f"{riskiest['name']} ({riskiest['size']} customers) has an average churn "
+                    f"score of {riskiest['avg_probability']:.2f}."
+                ),
+                "priority": "high" if riskiest["avg_probability"] >= 0.5 else "medium",
+                "impact": f"${riskiest['revenue_at_risk']:,.0f}/mo at risk",
+                "confidence": confidence(riskiest["size"]),
+                "recommendation": f"Tailor a campaign to the {riskiest['name']} cluster"
+            })
+
+        strategies = InsightService.rank_interventions(aggregates, limit=1)
+        if strategies:
+            top = strategies[0]
+            insights.append({
+                "title": "Top Retention Opportunity",
+                "description": f"{top['title']} for {top['target_segment']}: {top['description']}",
+                "priority": top["priority"],
+                "impact": f"${top['expected_impact']:,.0f} net over {horizon} months",
+                "confidence": confidence(top["details"]["customers_targeted"]),
+                "recommendation": top["actions"][0]
+            })
+
+        return insights
+
+    @staticmethod
+    def get_customer_insights(customer_id: str, db) -> Dict[str, Any]:
+        return {
+            "customer_id": customer_id,
+            "churn_probability": 0.65,
+            "risk_level": "HIGH",
+            "segment": "Premium Loyalists",
+            "recommendations": [
+                "Send immediate retention offer",
+                "Schedule call with account manager",
+                "Offer exclusive loyalty rewards"
+            ]
+        }
+
 insight_service = InsightService()
\ No newline at end of file
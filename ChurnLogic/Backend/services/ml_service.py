@@ -1,90 +1,322 @@
-"""ML Service"""
-import logging
-from typing import Dict, Any, List
-
-logger = logging.getLogger(__name__)
-
-class MLService:
-    @staticmethod
-    def train_churn_model(db):
-        logger.info("Training model...")
-        return "v1"
-    
-    @staticmethod
-    def predict_churn(db) -> List[Dict[str, Any]]:
-        return [
-            {
-                "customer_id": "cust_1",
-                "churn_probability": 0.65,
-                "risk_level": "HIGH"
-            }
-        ]
-    
-    @staticmethod
-    def cluster_customers(db) -> List[Dict[str, Any]]:
-        return [
-            {"customer_id": "cust_1", "cluster": 0},
-            {"customer_id": "cust_2", "cluster": 1}
-        ]
-    
-    @staticmethod
-    def get_model_metrics(db) -> Dict[str, Any]:
-        return {
-            "accuracy": 0.85,
-            "precision": 0.82,
-            "recall": 0.80,
-            "f1_score": 0.81,
-            "roc_auc": 0.88,
-            "model_version": "v1"
-        }
-    
-    @staticmethod
-    def get_total_customers(db) -> int:
-        return 1000
-    
-    @staticmethod
-    def get_churn_rate(db) -> float:
-        return 25.5
-    
-    @staticmethod
-    def get_at_risk_count(db) -> int:
-        return 250
-    
-    @staticmethod
-    def get_avg_churn_score(db) -> float:
-        return 0.45
-    
-    @staticmethod
-    def get_churn_distribution(db) -> List[Dict[str, Any]]:
-        return [
-            {"label": "Churned", "value": 255},
-            {"label": "Retained", "value": 745}
-        ]
-    
-    @staticmethod
-    def get_retention_by_segment(db) -> List[Dict[str, Any]]:
-        return [
-            {"segment": "Premium", "retention_rate": 85.5},
-            {"segment": "Standard", "retention_rate": 72.3},
-            {"segment": "Basic", "retention_rate": 58.9}
-        ]
-    
-    @staticmethod
-    def get_behavior_segments(db) -> List[Dict[str, Any]]:
-        return [
-            {"segment": "Premium Loyalists", "count": 250},
-            {"segment": "At-Risk Champions", "count": 180},
-            {"segment": "Price Sensitive", "count": 320},
-            {"segment": "Dormant Users", "count": 250}
-        ]
-    
-    @staticmethod
-    def get_cluster_summary(db) -> Dict[str, Any]:
-        return {
-            0: {"name": "Premium Loyalists", "size": 250, "percentage": 25.0},
-            1: {"name": "At-Risk Champions", "size": 180, "percentage": 18.0},
-            2: {"name": "Price Sensitive", "size": 320, "percentage": 32.0},
-            3: {"name": "Dormant Users", "size": 250, "percentage": 25.0}
-        }
-
+"""ML Service"""
+import logging
+from typing import TYPE_CHECKING, Dict, Any, List, Optional
+from sqlalchemy import delete, func, insert, select, update
+from config import settings
+from db.models import Cluster, DriftReport, ModelMetadata, Prediction
+from ml.registry import model_registry
+from services.data_service import data_service, ID_COLUMNS
+from services.dataset_store import dataset_store
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+class MLService:
+    @staticmethod
+    def _split_features(df: "pd.DataFrame", target_col: Optional[str] = None):
+        """Separate model features from the customer id and target columns"""
+        import pandas as pd
+
+        id_col = next((c for c in ID_COLUMNS if c in df.columns), None)
+        drop = [c for c in (id_col, target_col) if c is not None]
+        ids = df[id_col].astype(str) if id_col else pd.Series([f"CUST-{i}" for i in df.index], index=df.index)
+        return df.drop(columns=drop), ids
+
+    @staticmethod
+    def train_churn_model(dataset_id: str, df: "pd.DataFrame", db, tune: bool = False, profile=None) -> Dict[str, Any]:
+        # sklearn is imported on first use so the API can start serving before it loads
+        from ml.drift import DriftReference
+        from ml.model import ChurnPredictionModel
+        from ml.preprocessing import DataPreprocessor
+        from ml.tuning import SuccessiveHalvingSearch
+
+        logger.info(f"Training model for dataset {dataset_id}...")
+        y, churn_col = data_service.get_target_variable(df)
+        features, _ = MLService._split_features(df, churn_col)
+
+        preprocessor = DataPreprocessor()
+        X, feature_names = preprocessor.fit_transform(features, profile)
+
+        model = ChurnPredictionModel(
+            calibration_method=settings.CALIBRATION_METHOD,
+            customer_value=settings.RETENTION_CUSTOMER_VALUE,
+            contact_cost=settings.RETENTION_CONTACT_COST,
+            success_rate=settings.RETENTION_SUCCESS_RATE,
+            high_multiple=settings.RETENTION_HIGH_RISK_MULTIPLE,
+            cv_folds=settings.CV_FOLDS,
+            n_jobs=settings.TRAINING_N_JOBS
+        )
+        tuner = SuccessiveHalvingSearch(
+            model.xgb_model,
+            n_candidates=settings.TUNING_CANDIDATES,
+            eta=settings.TUNING_ETA,
+            cpu_budget_seconds=settings.TUNING_CPU_BUDGET_SECONDS,
+            auc_tolerance=settings.TUNING_AUC_TOLERANCE,
+            n_jobs=settings.TRAINING_N_JOBS,
+            random_state=settings.RANDOM_STATE
+        ) if tune else None
+        metrics = model.train(
+            X, y.to_numpy(), feature_names,
+            test_size=settings.TEST_SIZE, random_state=settings.RANDOM_STATE, tuner=tuner
+        )
+        drift_reference = DriftReference(n_bins=settings.DRIFT_BINS).fit(X, feature_names)
+        model_registry.save(dataset_id, model.model_version, {
+            "model": model,
+            "preprocessor": preprocessor,
+            "drift_reference": drift_reference
+        })
+
+        primary = metrics[metrics['primary_model']]
+        db.execute(update(ModelMetadata).where(ModelMetadata.dataset_id == dataset_id).values(is_active=False))
+        db.add(ModelMetadata(
+            model_version=model.model_version,
+            dataset_id=dataset_id,
+            model_type=metrics['primary_model'],
+            accuracy=float(primary['accuracy']),
+            precision=float(primary['precision']),
+            recall=float(primary['recall']),
+            f1_score=float(primary['f1']),
+            roc_auc=float(primary['roc_auc']),
+            feature_names=feature_names,
+            thresholds=model.thresholds,
+            hyperparameters=model.hyperparameters,
+            tuning_results=metrics.get('tuning'),
+            is_active=True
+        ))
+        db.commit()
+
+        return {"model_version": model.model_version, "metrics": metrics}
+    
+    @staticmethod
+    def predict_churn(dataset_id: str, df: "pd.DataFrame", db) -> List[Dict[str, Any]]:
+        bundle = model_registry.get_active(dataset_id)
+        if bundle is None:
+            raise ValueError(f"No trained model for dataset {dataset_id}")
+        model, preprocessor = bundle["model"], bundle["preprocessor"]
+
+        features, ids = MLService._split_features(df, data_service.find_target_column(df))
+        X = preprocessor.transform(features)
+        result = model.predict_batch(X)
+
+        rows = [
+            {
+                "customer_id": customer_id,
+                "dataset_id": dataset_id,
+                "churn_probability": probability,
+                "risk_level": risk_level,
+                "model_version": model.model_version
+            }
+            for customer_id, probability, risk_level in zip(ids, result['probabilities'], result['risk_levels'])
+        ]
+        db.execute(delete(Prediction).where(Prediction.dataset_id == dataset_id))
+        if rows:
+            db.execute(insert(Prediction), rows)
+        reference = bundle.get("drift_reference")
+        if reference is not None:
+            # The scoring batch is already transformed, so its drift is one extra bincount
+            MLService._save_drift_report(dataset_id, "scoring", model.model_version, reference.accumulator().update(X), db)
+        db.commit()
+        dataset_store.invalidate(dataset_id, "predictions")
+
+        return [
+            {key: row[key] for key in ("customer_id", "churn_probability", "risk_level")}
+            for row in rows
+        ]
+    
+    @staticmethod
+    def check_drift(dataset_id: str, df: "pd.DataFrame", db, source: str = "dataset") -> Optional[Dict[str, Any]]:
+        """Compare a dataset with its active model's training data, DRIFT_BATCH_ROWS rows at a time"""
+        bundle = model_registry.get_active(dataset_id)
+        if bundle is None or bundle.get("drift_reference") is None:
+            return None
+        model, preprocessor = bundle["model"], bundle["preprocessor"]
+
+        features, _ = MLService._split_features(df, data_service.find_target_column(df))
+        accumulator = bundle["drift_reference"].accumulator()
+        for start in range(0, len(features), settings.DRIFT_BATCH_ROWS):
+            batch = features.iloc[start:start + settings.DRIFT_BATCH_ROWS]
+            accumulator.update(preprocessor.transform(batch.copy(deep=False)))
+
+        report = MLService._save_drift_report(dataset_id, source, model.model_version, accumulator, db)
+        db.commit()
+        return report
+
+    @staticmethod
+    def _save_drift_report(dataset_id: str, source: str, model_version: str, accumulator, db) -> Dict[str, Any]:
+        report = accumulator.report(settings.DRIFT_PSI_THRESHOLD)
+        db.add(DriftReport(
+            dataset_id=dataset_id,
+            model_version=model_version,
+            source=source,
+            rows=report['rows'],
+            max_psi=report['max_psi'],
+            drifted_features=report['drifted_features'],
+            features=report['features']
+        ))
+        if report['drifted_features']:
+            logger.warning(f"Drift in dataset {dataset_id} ({source}): {', '.join(report['drifted_features'])}")
+        return {"dataset_id": dataset_id, "model_version": model_version, "source": source, **report}
+
+    @staticmethod
+    def get_drift_history(db, dataset_id: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        query = db.query(DriftReport)
+        if dataset_id is not None:
+            query = query.filter(DriftReport.dataset_id == dataset_id)
+        reports = query.order_by(DriftReport.created_at.desc(), DriftReport.id.desc()).limit(limit).all()
+        return [
+            {
+                "dataset_id": r.dataset_id,
+                "model_version": r.model_version,
+                "source": r.source,
+                "rows": r.rows,
+                "max_psi": r.max_psi,
+                "drifted_features": r.drifted_features,
+                "features": r.features,
+                "created_at": r.created_at.isoformat()
+            }
+            for r in reports
+        ]
+
+    @staticmethod
+    def get_drift_reference(db, dataset_id: str) -> Dict[str, Any]:
+        bundle = model_registry.get_active(dataset_id)
+        if bundle is None or bundle.get("drift_reference") is None:
+            return {"model_version": None, "features": []}
+        return {"model_version": bundle["model"].model_version, **bundle["drift_reference"].to_dict()}
+
+    @staticmethod
+    def cluster_customers(dataset_id: str, df: "pd.DataFrame", db, profile=None) -> Dict[str, Any]:
+        """Segment the dataset's customers with k-means and store each customer's cluster"""
+        import numpy as np
+        from ml.clustering import CustomerClusterer
+        from ml.preprocessing import DataPreprocessor
+
+        features, ids = MLService._split_features(df, data_service.find_target_column(df))
+        preprocessor = DataPreprocessor()
+        X, _ = preprocessor.fit_transform(features, profile)
+
+        clusterer = CustomerClusterer(n_clusters=min(settings.N_CLUSTERS, len(X)))
+        clusters, summary = clusterer.fit_predict(X)
+        engagement = np.nan_to_num(clusterer.calculate_engagement_score(preprocessor.coerce_numeric(features), clusters))
+
+        rows = [
+            {
+                "customer_id": customer_id,
+                "dataset_id": dataset_id,
+                "cluster_id": int(cluster_id),
+                "cluster_name": clusterer.cluster_names.get(int(cluster_id), f"Cluster {cluster_id}"),
+                "engagement_score": float(score)
+            }
+            for customer_id, cluster_id, score in zip(ids, clusters, engagement)
+        ]
+        db.execute(delete(Cluster).where(Cluster.dataset_id == dataset_id))
+        if rows:
+            db.execute(insert(Cluster), rows)
+        db.commit()
+        dataset_store.invalidate(dataset_id, "clusters")
+
+        return {
+            "n_clusters": summary['n_clusters'],
+            "inertia": summary['inertia'],
+            **MLService.get_cluster_summary(db, dataset_id)
+        }
+    
+    @staticmethod
+    def get_model_metrics(db, dataset_id: str) -> Dict[str, Any]:
+        bundle = model_registry.get_active(dataset_id)
+        if bundle is None:
+            return {"accuracy": 0.0, "precision": 0.0, "recall": 0.0, "f1_score": 0.0, "roc_auc": 0.0, "model_version": None}
+
+        model = bundle["model"]
+        metrics = model.get_metrics()
+        primary = metrics[metrics['primary_model']]
+        return {
+            "accuracy": primary['accuracy'],
+            "precision": primary['precision'],
+            "recall": primary['recall'],
+            "f1_score": primary['f1'],
+            "roc_auc": primary['roc_auc'],
+            "model_version": model.model_version,
+            "hyperparameters": getattr(model, 'hyperparameters', {})
+        }
+
+    @staticmethod
+    def get_threshold_analysis(db, dataset_id: str) -> Dict[str, Any]:
+        bundle = model_registry.get_active(dataset_id)
+        if bundle is None:
+            return {"model_version": None, "thresholds": {}, "curves": {}}
+
+        model = bundle["model"]
+        return {"model_version": model.model_version, **model.get_threshold_analysis()}
+
+    @staticmethod
+    def get_feature_importance(db, dataset_id: str) -> List[Dict[str, Any]]:
+        bundle = model_registry.get_active(dataset_id)
+        return bundle["model"].get_feature_importance() if bundle else []
+    
+    @staticmethod
+    def get_total_customers(db) -> int:
+        return 1000
+    
+    @staticmethod
+    def get_churn_rate(db) -> float:
+        return 25.5
+    
+    @staticmethod
+    def get_at_risk_count(db) -> int:
+        return 250
+    
+    @staticmethod
+    def get_avg_churn_score(db) -> float:
+        return 0.45
+    
+    @staticmethod
+    def get_churn_distribution(db) -> List[Dict[str, Any]]:
+        return [
+            {"label": "Churned", "value": 255},
+            {"label": "Retained", "value": 745}
+        ]
+    
+    @staticmethod
+    def get_retention_by_segment(db) -> List[Dict[str, Any]]:
+        return [
+            {"segment": "Premium", "retention_rate": 85.5},
+            {"segment": "Standard", "retention_rate": 72.3},
+            {"segment": "Basic", "retention_rate": 58.9}
+        ]
+    
+    @staticmethod
+    def get_behavior_segments(db) -> List[Dict[str, Any]]:
+        return [
+            {"segment": "Premium Loyalists", "count": 250},
+            {"segment": "At-Risk Champions", "count": 180},
+            {"segment": "Price Sensitive", "count": 320},
+            {"segment": "Dormant Users", "count": 250}
+        ]
+    
+    @staticmethod
+    def get_cluster_summary(db, dataset_id: str) -> Dict[str, Any]:
+        rows = db.execute(
+            select(Cluster.cluster_id, Cluster.cluster_name, func.count(Cluster.id), func.avg(Cluster.engagement_score))
+            .where(Cluster.dataset_id == dataset_id)
+            .group_by(Cluster.cluster_id, Cluster.cluster_name)
+            .order_by(Cluster.cluster_id)
+        ).all()
+        total = sum(size for _, _, size, _ in rows)
+        return {
+            "total_customers": total,
+            "clusters": [
+                {
+                    "cluster_id": cluster_id,
+                    "name": name,
+                    "size": size,
+                    "percentage": round(size / total * 100, 1),
+                    "avg_engagement": round(float(engagement or 0.0), 3)
+                }
+                for cluster_id, name, size, engagement in rows
+            ]
+        }
+
 ml_service = MLService()
\ No newline at end of file
@@ -0,0 +1,310 @@
+"""Streaming Data Profiling"""
+import numpy as np
+import pandas as pd
+import logging
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# A column counts as numeric when at least this share of its non-null values parse as numbers
+NUMERIC_CONFORMANCE = 0.9
+# Churn flag columns; numeric columns also get a sketch of their values in churned rows
+TARGET_COLUMNS = ["churn", "Churn", "CHURN", "churn_status", "Churn_Status"]
+
+class HyperLogLog:
+    """Approximate distinct count in 2**precision one-byte registers (~1.6% error at 12).
+
+    Until the column has seen more distinct values than a quarter of the
+    register count, the hashes themselves are kept and counted exactly.
+    """
+    def __init__(
+        self,
+        precision: int = 12,
+        registers: Optional[np.ndarray] = None,
+        exact: Optional[np.ndarray] = None
+    ):
+        self.precision = precision
+        self.registers = registers if registers is not None else np.zeros(1 << precision, dtype=np.uint8)
+        self.exact = exact if exact is not None or registers is not None else np.empty(0, dtype=np.uint64)
+
+    def update(self, hashes: np.ndarray):
+        if len(hashes) == 0:
+            return
+        hashes = hashes.astype(np.uint64, copy=False)
+        if self.exact is not None:
+            self.exact = np.union1d(self.exact, hashes)
+            if len(self.exact) > len(self.registers) // 4:
+                self.exact = None
+        width = 64 - self.precision
+        index = (hashes >> np.uint64(width)).astype(np.intp)
+        rest = hashes & np.uint64((1 << width) - 1)
+        # Rank of the first set bit in the remaining bits; frexp's exponent is the bit length
+        rank = (width + 1 - np.frexp(rest.astype(np.float64))[1]).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def count(self) -> int:
+        if self.exact is not None:
+            return len(self.exact)
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate for small cardinalities
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'precision': self.precision,
+            'registers': self.registers.tobytes().hex(),
+            'exact': self.exact.tobytes().hex() if self.exact is not None else None
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'HyperLogLog':
+        registers = np.frombuffer(bytes.fromhex(data['registers']), dtype=np.uint8).copy()
+        exact = np.frombuffer(bytes.fromhex(data['exact']), dtype=np.uint64).copy() if data['exact'] is not None else None
+        return cls(data['precision'], registers, exact)
+
+class KLLSketch:
+    """Approximate quantiles in O(k log(n/k)) memory.
+
+    Values enter level 0. When a level outgrows its capacity it is sorted
+    and every other item (from a random offset) is promoted to the next
+    level with twice the weight. Lower levels get geometrically smaller
+    capacities, so memory stays bounded however many rows stream through.
+    """
+    def __init__(self, k: int = 200, seed: int = 0):
+        self.k = k
+        self.n = 0
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def update(self, values: np.ndarray):
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self.n += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # An odd item out stays behind so the total weight is preserved
+                leftover, items = items[:len(items) % 2], items[len(items) % 2:]
+                promoted = items[int(self._rng.integers(2))::2]
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+                self.levels[level] = leftover
+            level += 1
+
+    def quantiles(self, qs) -> List[Optional[float]]:
+        if self.n == 0:
+            return [None for _ in qs]
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(l), 2 ** h, dtype=np.int64) for h, l in enumerate(self.levels)])
+        order = np.argsort(items, kind='mergesort')
+        items, cumulative = items[order], np.cumsum(weights[order])
+        idx = np.searchsorted(cumulative, np.asarray(qs, dtype=float) * cumulative[-1], side='left')
+        return items[np.minimum(idx, len(items) - 1)].tolist()
+
+    def rank(self, values) -> List[int]:
+        """Approximate number of values seen that are <= each of values"""
+        if self.n == 0:
+            return [0 for _ in values]
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(l), 2 ** h, dtype=np.int64) for h, l in enumerate(self.levels)])
+        order = np.argsort(items, kind='mergesort')
+        cumulative = np.concatenate([[0], np.cumsum(weights[order])])
+        return cumulative[np.searchsorted(items[order], np.asarray(values, dtype=float), side='right')].tolist()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'k': self.k, 'n': self.n, 'levels': [l.tolist() for l in self.levels]}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'KLLSketch':
+        sketch = cls(data['k'])
+        sketch.n = data['n']
+        sketch.levels = [np.asarray(l, dtype=float) for l in data['levels']]
+        return sketch
+
+class ColumnProfile:
+    """Null count, numeric conformance, cardinality and quantiles for one column
+
+    churned_sketch holds the column's numbers from churned rows only, so
+    churn by value range can be read back without the data.
+    """
+    def __init__(self, name: str):
+        self.name = name
+        self.rows = 0
+        self.nulls = 0
+        self.numeric = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = None
+        self.invalid_examples: List[str] = []
+        self.distinct = HyperLogLog()
+        self.quantile_sketch = KLLSketch()
+        self.churned_sketch = KLLSketch()
+
+    def update(self, values: pd.Series, churned: Optional[pd.Series] = None):
+        self.rows += len(values)
+        present = values.dropna()
+        self.nulls += len(values) - len(present)
+
+        if present.dtype.kind in "biuf":
+            numbers = present.to_numpy(dtype=np.float64)
+            index = present.index
+            text = None
+        else:
+            coerced = pd.to_numeric(present, errors='coerce')
+            parsed = coerced.notna()
+            numbers = coerced[parsed].to_numpy(dtype=np.float64)
+            index = coerced.index[parsed.to_numpy()]
+            text = present[~parsed].astype(str)
+            for value in text.unique():
+                if len(self.invalid_examples) >= 5:
+                    break
+                if value not in self.invalid_examples:
+                    self.invalid_examples.append(value)
+
+        self.numeric += len(numbers)
+        if len(numbers):
+            self.total += float(numbers.sum())
+            low, high = float(numbers.min()), float(numbers.max())
+            self.minimum = low if self.minimum is None else min(self.minimum, low)
+            self.maximum = high if self.maximum is None else max(self.maximum, high)
+            self.quantile_sketch.update(numbers)
+            if churned is not None:
+                self.churned_sketch.update(numbers[churned[index].to_numpy()])
+
+        # Hash numbers by value so 1, 1.0 and "1" across chunks count once
+        self.distinct.update(pd.util.hash_array(numbers))
+        if text is not None and len(text):
+            self.distinct.update(pd.util.hash_array(text.to_numpy(dtype=object)))
+
+    @property
+    def non_null(self) -> int:
+        return self.rows - self.nulls
+
+    @property
+    def kind(self) -> str:
+        if self.non_null == 0:
+            return 'empty'
+        return 'numeric' if self.numeric >= NUMERIC_CONFORMANCE * self.non_null else 'text'
+
+    def median(self) -> Optional[float]:
+        return self.quantile_sketch.quantiles([0.5])[0]
+
+    def summary(self) -> Dict[str, Any]:
+        summary = {
+            'name': self.name,
+            'kind': self.kind,
+            'nulls': self.nulls,
+            'null_rate': round(self.nulls / self.rows, 4) if self.rows else 0.0,
+            'distinct': min(self.distinct.count(), self.non_null),
+            'conformance': round(self.numeric / self.non_null, 4) if self.non_null else 0.0
+        }
+        if self.kind == 'numeric':
+            p25, p50, p75 = self.quantile_sketch.quantiles([0.25, 0.5, 0.75])
+            summary.update({
+                'min': self.minimum, 'p25': p25, 'median': p50, 'p75': p75, 'max': self.maximum,
+                'mean': self.total / self.numeric
+            })
+        return summary
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name, 'rows': self.rows, 'nulls': self.nulls, 'numeric': self.numeric,
+            'total': self.total, 'minimum': self.minimum, 'maximum': self.maximum,
+            'invalid_examples': self.invalid_examples,
+            'distinct': self.distinct.to_dict(), 'quantiles': self.quantile_sketch.to_dict(),
+            'churned': self.churned_sketch.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ColumnProfile':
+        profile = cls(data['name'])
+        for attr in ('rows', 'nulls', 'numeric', 'total', 'minimum', 'maximum', 'invalid_examples'):
+            setattr(profile, attr, data[attr])
+        profile.distinct = HyperLogLog.from_dict(data['distinct'])
+        profile.quantile_sketch = KLLSketch.from_dict(data['quantiles'])
+        profile.churned_sketch = KLLSketch.from_dict(data['churned'])
+        return profile
+
+class DataProfile:
+    """Profile of a whole dataset, built one chunk at a time as the CSV is read"""
+    def __init__(self):
+        self.rows = 0
+        self.columns: Dict[str, ColumnProfile] = {}
+        self.target_col: Optional[str] = None
+
+    def update(self, chunk: pd.DataFrame):
+        if self.rows == 0:
+            self.target_col = next((str(c) for c in chunk.columns if c in TARGET_COLUMNS), None)
+        self.rows += len(chunk)
+        churned = None
+        if self.target_col is not None:
+            churned = pd.to_numeric(chunk[self.target_col], errors='coerce') == 1
+        for col in chunk.columns:
+            name = str(col)
+            if name not in self.columns:
+                self.columns[name] = ColumnProfile(name)
+            self.columns[name].update(chunk[col], churned)
+
+    def warnings(self, target_col: Optional[str] = None, id_col: Optional[str] = None) -> List[str]:
+        warnings = []
+        if self.rows == 0:
+            return ["The file has no data rows"]
+        if target_col is None:
+            warnings.append("No churn column found; model training will not be available")
+
+        for name, col in self.columns.items():
+            if col.non_null == 0:
+                warnings.append(f"Column '{name}' is empty")
+                continue
+            if col.nulls:
+                warnings.append(f"Column '{name}' has {col.nulls} missing values ({col.nulls / col.rows:.1%})")
+            if col.kind == 'numeric' and col.numeric < col.non_null:
+                examples = ", ".join(repr(v) for v in col.invalid_examples)
+                warnings.append(
+                    f"Column '{name}' is numeric but {col.non_null - col.numeric} values are not numbers "
+                    f"(e.g. {examples}); they will be treated as missing"
+                )
+
+            distinct = col.distinct.count()
+            if distinct <= 1 and col.non_null > 1:
+                warnings.append(f"Column '{name}' has a single value and carries no information")
+            elif name == id_col and distinct < 0.95 * col.non_null:
+                warnings.append(f"Column '{name}' has duplicate IDs (~{distinct} distinct of {col.non_null})")
+            elif name == target_col and col.kind == 'numeric' and (col.minimum < 0 or col.maximum > 1):
+                warnings.append(f"Churn column '{name}' should contain only 0 and 1")
+        return warnings
+
+    def summary(self) -> Dict[str, Any]:
+        return {'rows': self.rows, 'columns': [col.summary() for col in self.columns.values()]}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'rows': self.rows, 'target_col': self.target_col,
+            'columns': [col.to_dict() for col in self.columns.values()]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'DataProfile':
+        profile = cls()
+        profile.rows = data['rows']
+        profile.target_col = data['target_col']
+        for col in data['columns']:
+            profile.columns[col['name']] = ColumnProfile.from_dict(col)
+        return profile
\ No newline at end of file
@@ -0,0 +1,158 @@
+"""Survival Analysis Service"""
+import logging
+from typing import TYPE_CHECKING, Dict, Any, List, Optional
+from sqlalchemy import func, select
+from config import settings
+from db.models import Cluster
+from services.data_service import data_service, ID_COLUMNS
+from services.dataset_store import dataset_store
+from services.insight_service import CHARGE_TIERS
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+SPLITS = ("none", "charge_tier", "cluster")
+
+class SurvivalService:
+    """Kaplan-Meier retention curves by tenure month.
+
+    One pass over the customers bins them into (group x tenure month)
+    matrices of churn events and exits. Customers at risk in month t are
+    a reverse cumulative sum of exits, so hazards and survival for every
+    group come from a few array operations with no per-group loop. The
+    matrices are cached per dataset version; curves are computed from them
+    on each request, which is cheap enough to slice interactively.
+    """
+    @staticmethod
+    def get_counts(dataset_id: str, by: str, db) -> Optional[Dict[str, Any]]:
+        run = None
+        if by == "cluster":
+            # Cluster rows are replaced wholesale; the newest id identifies the current assignment
+            run = db.execute(
+                select(func.max(Cluster.id)).where(Cluster.dataset_id == dataset_id)
+            ).scalar()
+        return dataset_store.get_aggregate(
+            dataset_id, f"survival:{by}", lambda df: SurvivalService._build_counts(dataset_id, df, by, db), run=run
+        )
+
+    @staticmethod
+    def _build_counts(dataset_id: str, df: "pd.DataFrame", by: str, db) -> Dict[str, Any]:
+        import numpy as np
+        import pandas as pd
+
+        tenure_col = next((c for c in ["tenure", "Tenure", "TENURE"] if c in df.columns), None)
+        churn_col = data_service.find_target_column(df)
+        if tenure_col is None or churn_col is None:
+            return {"error": "Survival analysis needs tenure and churn columns"}
+
+        tenure = pd.to_numeric(df[tenure_col], errors='coerce').to_numpy(dtype=float)
+        churned = pd.to_numeric(df[churn_col], errors='coerce').to_numpy(dtype=float)
+        valid = ~np.isnan(tenure) & (tenure >= 0) & ~np.isnan(churned)
+
+        if by == "charge_tier":
+            charge_col = next((c for c in ["monthly_charges", "MonthlyCharges", "monthly_charge"] if c in df.columns), None)
+            if charge_col is None:
+                return {"error": "No monthly charges column to split by"}
+            charge = pd.to_numeric(df[charge_col], errors='coerce').to_numpy(dtype=float)
+            valid &= ~np.isnan(charge)
+            group = np.searchsorted(CHARGE_TIERS[0], np.nan_to_num(charge), side='left')
+            labels = CHARGE_TIERS[1]
+        elif by == "cluster":
+            id_col = next((c for c in ID_COLUMNS if c in df.columns), None)
+            rows = db.execute(
+                select(Cluster.customer_id, Cluster.cluster_id, Cluster.cluster_name)
+                .where(Cluster.dataset_id == dataset_id)
+            ).all()
+            if id_col is None or not rows:
+                return {"error": "No cluster assignments for this dataset"}
+            assigned = pd.DataFrame(rows, columns=["customer_id", "cluster_id", "cluster_name"]).drop_duplicates("customer_id")
+            cluster_ids = df[id_col].astype(str).map(assigned.set_index("customer_id")["cluster_id"]).to_numpy(dtype=float)
+            valid &= ~np.isnan(cluster_ids)
+            group = np.nan_to_num(cluster_ids).astype(np.int64)
+            names = dict(zip(assigned["cluster_id"], assigned["cluster_name"]))
+            labels = [names.get(g, f"Cluster {g}") for g in range(int(group[valid].max()) + 1 if valid.any() else 0)]
+        else:
+            group = np.zeros(len(df), dtype=np.int64)
+            labels = ["All customers"]
+
+        # Customers past the horizon are censored at it: they were still active then
+        months = np.minimum(np.floor(tenure[valid]), settings.SURVIVAL_MAX_MONTHS).astype(np.int64)
+        # so a churn after the horizon is not an event at it
+        event = (churned[valid] > 0) & (tenure[valid] <= settings.SURVIVAL_MAX_MONTHS)
+        group = group[valid]
+        n_months = int(months.max()) + 1 if len(months) else 1
+        cells = group * n_months + months
+
+        size = len(labels) * n_months
+        exits = np.bincount(cells, minlength=size).reshape(len(labels), n_months)
+        events = np.bincount(cells[event], minlength=size).reshape(len(labels), n_months)
+
+        logger.info(f"Built survival counts for dataset {dataset_id} by {by}: {len(months)} customers, {n_months} months")
+        return {"labels": labels, "events": events, "exits": exits}
+
+    @staticmethod
+    def kaplan_meier(events, exits) -> Dict[str, Any]:
+        """Survival, hazard and 95% Greenwood bounds for each row of (groups x months) counts"""
+        import numpy as np
+
+        # At risk in month t: everyone whose tenure is t or more
+        at_risk = np.cumsum(exits[:, ::-1], axis=1)[:, ::-1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            hazard = np.where(at_risk > 0, events / at_risk, 0.0)
+            survival = np.cumprod(1.0 - hazard, axis=1)
+            greenwood = np.cumsum(
+                np.where(at_risk > events, events / (at_risk * (at_risk - events)), 0.0), axis=1
+            )
+        margin = 1.96 * survival * np.sqrt(greenwood)
+        return {
+            "at_risk": at_risk,
+            "hazard": hazard,
+            "survival": survival,
+            "lower": np.clip(survival - margin, 0.0, 1.0),
+            "upper": np.clip(survival + margin, 0.0, 1.0)
+        }
+
+    @staticmethod
+    def get_survival(
+        dataset_id: str,
+        db,
+        by: str = "none",
+        groups: Optional[List[str]] = None,
+        max_tenure: Optional[int] = None
+    ) -> Dict[str, Any]:
+        import numpy as np
+
+        if by not in SPLITS:
+            return {"status": "error", "message": f"by must be one of {', '.join(SPLITS)}"}
+        counts = SurvivalService.get_counts(dataset_id, by, db)
+        if counts is None:
+            return {"status": "no_data"}
+        if "error" in counts:
+            return {"status": "error", "message": counts["error"]}
+
+        labels = counts["labels"]
+        rows = [i for i, label in enumerate(labels) if not groups or label in groups]
+        events, exits = counts["events"][rows], counts["exits"][rows]
+        curves = SurvivalService.kaplan_meier(events, exits)
+
+        months = events.shape[1] if max_tenure is None else min(events.shape[1], max_tenure + 1)
+        below_half = curves["survival"] <= 0.5
+        result = []
+        for j, i in enumerate(rows):
+            if exits[j].sum() == 0:
+                continue
+            result.append({
+                "group": labels[i],
+                "customers": int(exits[j].sum()),
+                "churned": int(events[j].sum()),
+                # First month by which half the group has churned, if it gets there
+                "median_tenure": int(np.argmax(below_half[j])) if below_half[j].any() else None,
+                **{name: np.round(values[j, :months], 4).tolist() for name, values in curves.items() if name != "at_risk"},
+                "at_risk": curves["at_risk"][j, :months].tolist()
+            })
+
+        return {"status": "ok", "by": by, "tenure": list(range(months)), "groups": result}
+
+survival_service = SurvivalService()
\ No newline at end of file
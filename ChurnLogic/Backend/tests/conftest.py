@@ -0,0 +1,10 @@
+"""Test Settings"""
+import os
+import tempfile
+
+# Services bind the database, dataset store and model registry at import, so point them
+# at a scratch directory before any test module imports them
+_scratch = tempfile.mkdtemp(prefix="churnlogic-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_scratch, 'churnlogic.db')}"
+os.environ["DATASET_PATH"] = os.path.join(_scratch, "datasets")
+os.environ["MODEL_PATH"] = os.path.join(_scratch, "models")
\ No newline at end of file
@@ -0,0 +1,77 @@
+"""Threshold Sweep and Optimizer Tests"""
+import numpy as np
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.metrics import roc_auc_score
+from ml.calibration import ProbabilityCalibrator, ThresholdOptimizer, threshold_sweep
+from ml.model import ChurnPredictionModel
+
+# Calibrated scores, highest first; only the two top customers churn
+Y_PROBA = np.array([0.9, 0.6, 0.3, 0.1, 0.05, 0.02])
+Y_TRUE = np.array([1, 1, 0, 0, 0, 0])
+
+def test_threshold_sweep_counts_and_value():
+    sweep = threshold_sweep(Y_TRUE, Y_PROBA, customer_value=500.0, contact_cost=20.0, success_rate=0.3)
+
+    np.testing.assert_array_equal(sweep['thresholds'], Y_PROBA)
+    np.testing.assert_array_equal(sweep['targeted'], [1, 2, 3, 4, 5, 6])
+    np.testing.assert_array_equal(sweep['true_positives'], [1, 2, 2, 2, 2, 2])
+    np.testing.assert_allclose(sweep['precision'], [1.0, 1.0, 2 / 3, 0.5, 0.4, 1 / 3])
+    np.testing.assert_allclose(sweep['recall'], [0.5, 1.0, 1.0, 1.0, 1.0, 1.0])
+    # 0.3 * 500 per churner reached, minus 20 per customer contacted
+    np.testing.assert_allclose(sweep['expected_value'], [130, 260, 240, 220, 200, 180])
+
+def test_threshold_sweep_groups_tied_scores():
+    sweep = threshold_sweep(np.array([1, 0, 1]), np.array([0.8, 0.8, 0.2]))
+
+    np.testing.assert_array_equal(sweep['thresholds'], [0.8, 0.2])
+    np.testing.assert_array_equal(sweep['targeted'], [2, 3])
+    np.testing.assert_array_equal(sweep['true_positives'], [1, 2])
+
+def test_optimizer_bands_on_marginal_value():
+    y_proba = np.array([0.9, 0.6, 0.3, 0.2, 0.1, 0.05])
+    y_true = np.array([1, 1, 0, 1, 0, 0])
+    optimizer = ThresholdOptimizer(customer_value=500.0, contact_cost=20.0, success_rate=0.3, high_multiple=2.0)
+    thresholds = optimizer.fit(y_true, y_proba)
+
+    # Break-even is 20 / (0.3 * 500) = 0.133: 0.2 is worth a contact, 0.1 is not, even though
+    # the cumulative value stays positive all the way down. HIGH needs twice that, 0.267.
+    assert thresholds['medium'] == 0.2
+    assert thresholds['high'] == 0.3
+    assert optimizer.get_summary()['assumptions']['break_even_probability'] == 20.0 / 150.0
+
+def test_optimizer_empty_bands_when_nothing_breaks_even():
+    optimizer = ThresholdOptimizer(customer_value=500.0, contact_cost=200.0, success_rate=0.3)
+    thresholds = optimizer.fit(Y_TRUE, Y_PROBA)
+
+    # Break-even is past certainty, so both cutoffs sit above every score
+    assert thresholds == {'high': 1.0, 'medium': 1.0}
+    assert (Y_PROBA < thresholds['medium']).all()
+
+def test_optimizer_rejects_high_multiple_at_or_below_one():
+    with pytest.raises(ValueError):
+        ThresholdOptimizer(high_multiple=1.0)
+
+def test_cross_fit_does_not_score_rows_with_their_own_calibrator():
+    # Scores carry no signal, so any apparent AUC comes from the calibrator memorizing labels
+    rng = np.random.default_rng(0)
+    y_proba = rng.random(400)
+    y_true = (rng.random(400) < 0.3).astype(int)
+    calibrator = ProbabilityCalibrator('isotonic')
+    held_out = calibrator.cross_fit(y_proba, y_true, n_folds=5)
+
+    assert held_out.shape == y_proba.shape
+    assert roc_auc_score(y_true, held_out) < roc_auc_score(y_true, calibrator.transform(y_proba))
+
+def test_trained_model_uses_all_three_risk_levels():
+    X, y = make_classification(
+        n_samples=3000, n_features=8, n_informative=4, weights=[0.8], flip_y=0.05, random_state=0
+    )
+    model = ChurnPredictionModel(cv_folds=2, n_jobs=1)
+    model.train(X, y, [f"f{i}" for i in range(X.shape[1])])
+
+    assert model.thresholds['medium'] < model.thresholds['high']
+    result = model.predict_batch(X)
+    assert result['count_high_risk'] > 0
+    assert result['count_medium_risk'] > 0
+    assert result['count_low_risk'] > 0
\ No newline at end of file
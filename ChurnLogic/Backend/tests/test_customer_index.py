@@ -0,0 +1,110 @@
+"""Customer Index Tests"""
+import numpy as np
+import pandas as pd
+import pytest
+from services.customer_index import CustomerIndex
+
+N = 5000
+
+@pytest.fixture(scope="module")
+def customers():
+    rng = np.random.default_rng(0)
+    tenure = rng.integers(0, 72, size=N).astype(float)
+    tenure[rng.random(N) < 0.02] = np.nan
+    probability = rng.random(N).round(3)
+    df = pd.DataFrame({
+        "customer_id": [f"C{i:05d}" for i in rng.permutation(N)],
+        "tenure": tenure,
+        "monthly_charges": rng.uniform(20, 120, size=N).round(1),
+        "probability": probability,
+        "risk": np.where(probability >= 0.7, "HIGH", np.where(probability >= 0.4, "MEDIUM", "LOW")),
+        "cluster": rng.integers(0, 4, size=N)
+    })
+    # Some customers were never scored or clustered
+    df.loc[rng.random(N) < 0.05, ["probability", "risk"]] = [np.nan, None]
+    df.loc[rng.random(N) < 0.05, "cluster"] = -1
+    return df
+
+def build(df, tmp_path=None):
+    index = CustomerIndex.build(df[["customer_id", "tenure", "monthly_charges"]])
+    if tmp_path is not None:
+        index.save(str(tmp_path))
+        index = CustomerIndex.load(str(tmp_path))
+    scored = df[df["probability"].notna()]
+    clustered = df[df["cluster"] >= 0]
+    scores = index.scores(
+        (scored["customer_id"].tolist(), scored["probability"].tolist(), scored["risk"].tolist()),
+        (clustered["customer_id"].tolist(), clustered["cluster"].tolist(), [f"Group {c}" for c in clustered["cluster"]])
+    )
+    return index, scores
+
+def brute_force(df, prefix=None, ranges=None, risk_levels=None, clusters=None, sort="risk"):
+    mask = pd.Series(True, index=df.index)
+    if prefix:
+        mask &= df["customer_id"].str.startswith(prefix)
+    columns = {"tenure": "tenure", "monthly_charges": "monthly_charges", "churn_probability": "probability"}
+    for name, (low, high) in (ranges or {}).items():
+        values = df[columns[name]]
+        if low is not None:
+            mask &= values >= low
+        if high is not None:
+            mask &= values <= high
+    if risk_levels is not None:
+        mask &= df["risk"].isin(risk_levels)
+    if clusters is not None:
+        mask &= df["cluster"].isin(clusters)
+
+    matched = df[mask]
+    if sort == "risk":
+        matched = matched.assign(key=-matched["probability"]).sort_values("key", kind="stable", na_position="last")
+    else:
+        matched = matched.sort_values("customer_id", kind="stable")
+    return matched.index.to_numpy()
+
+# Broad filters take the scan path, selective ones the top-k path
+QUERIES = [
+    {},
+    {"prefix": "C01"},
+    {"prefix": "C0123"},
+    {"prefix": "X"},
+    {"ranges": {"tenure": (12, 24)}},
+    {"ranges": {"tenure": (None, 3), "monthly_charges": (100, None)}},
+    {"ranges": {"churn_probability": (0.5, 0.6)}},
+    {"ranges": {"churn_probability": (0.0, 1.0)}},
+    {"risk_levels": ["HIGH"]},
+    {"risk_levels": ["LOW", "MEDIUM"], "clusters": [2]},
+    {"clusters": [0, 3], "ranges": {"monthly_charges": (30, 90)}},
+    {"prefix": "C02", "risk_levels": ["HIGH"], "ranges": {"tenure": (6, None)}},
+    {"clusters": [7]},
+]
+
+@pytest.mark.parametrize("query", QUERIES)
+@pytest.mark.parametrize("sort", ["risk", "customer_id"])
+def test_search_matches_a_pandas_filter(customers, query, sort):
+    index, scores = build(customers)
+    expected = brute_force(customers, sort=sort, **query)
+
+    for offset, limit in [(0, 50), (40, 25), (len(expected) - 5, 50)]:
+        offset = max(offset, 0)
+        total, rows = index.search(scores, sort=sort, offset=offset, limit=limit, **query)
+        assert total == len(expected)
+        np.testing.assert_array_equal(rows, expected[offset:offset + limit])
+
+def test_loaded_index_searches_like_the_built_one(customers, tmp_path):
+    built, built_scores = build(customers)
+    loaded, loaded_scores = build(customers, tmp_path)
+
+    query = {"prefix": "C03", "ranges": {"tenure": (0, 30)}, "risk_levels": ["MEDIUM", "HIGH"]}
+    assert built.search(built_scores, **query)[0] == loaded.search(loaded_scores, **query)[0]
+    np.testing.assert_array_equal(built.search(built_scores, **query)[1], loaded.search(loaded_scores, **query)[1])
+
+def test_locate_reports_missing_ids(customers):
+    index, _ = build(customers)
+    rows, found = index.locate(["C00042", "nobody", "C04999"])
+    assert found.tolist() == [True, False, True]
+    assert customers.loc[rows, "customer_id"].tolist() == ["C00042", "C04999"]
+
+def test_missing_range_column_matches_nothing(customers):
+    index = CustomerIndex.build(customers[["customer_id"]])
+    total, rows = index.search(index.scores(), ranges={"tenure": (1, 10)})
+    assert total == 0 and len(rows) == 0
\ No newline at end of file
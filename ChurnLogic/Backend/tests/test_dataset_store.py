@@ -0,0 +1,71 @@
+"""Dataset Store Tests"""
+import io
+import numpy as np
+from services.dataset_store import DatasetStore
+
+def csv(rows: int, offset: int = 0) -> io.BytesIO:
+    lines = ["customer_id,tenure,monthly_charges,churn"]
+    lines += [f"C{i:06d},{i % 72},{20 + i % 80}.5,{i % 2}" for i in range(offset, offset + rows)]
+    return io.BytesIO("\n".join(lines).encode())
+
+def test_evicts_least_recently_used_datasets(tmp_path):
+    store = DatasetStore(str(tmp_path), memory_budget_bytes=10 ** 9)
+    one = store.put("a", csv(1000)).nbytes
+    store.memory_budget_bytes = int(2.5 * one)
+    store.put("b", csv(1000))
+    store.get("a")
+    store.put("c", csv(1000))
+
+    # b was used least recently, so it went first; it comes back from disk on request
+    assert [d["dataset_id"] for d in store.list_datasets() if d["loaded"]] == ["a", "c"]
+    assert len(store.get("b").df) == 1000
+    # which in turn evicts a, now the least recently used
+    assert [d["dataset_id"] for d in store.list_datasets() if d["loaded"]] == ["b", "c"]
+
+def test_reupload_swaps_to_the_new_version(tmp_path):
+    store = DatasetStore(str(tmp_path), memory_budget_bytes=10 ** 9)
+    first = store.put("a", csv(10))
+    store.get_aggregate("a", "rows", len)
+
+    # Another worker's store sees the new version through CURRENT on its next access
+    other = DatasetStore(str(tmp_path), memory_budget_bytes=10 ** 9)
+    assert other.get("a").version == first.version
+    second = store.put("a", csv(20, offset=100))
+
+    assert second.version != first.version
+    assert other.get("a").version == second.version
+    assert other.get("a").df["customer_id"].iloc[0] == "C000100"
+    # Aggregates of the old version are not carried over
+    assert store.get_aggregate("a", "rows", len) == 20
+
+def test_aggregates_count_toward_the_budget(tmp_path):
+    store = DatasetStore(str(tmp_path), memory_budget_bytes=10 ** 9)
+    store.put("a", csv(100))
+    store.put("b", csv(100))
+    before = store.get("b").nbytes
+
+    store.get_aggregate("b", "big", lambda df: np.zeros(1_000_000))
+    assert store.get("b").nbytes >= before + 8_000_000
+
+    # Crossing the budget with an aggregate evicts the other dataset
+    store.memory_budget_bytes = store.get("b").nbytes + 1000
+    store.get_aggregate("b", "bigger", lambda df: np.zeros(10))
+    assert [d["dataset_id"] for d in store.list_datasets() if d["loaded"]] == ["b"]
+
+def test_new_run_replaces_the_superseded_aggregate(tmp_path):
+    store = DatasetStore(str(tmp_path), memory_budget_bytes=10 ** 9)
+    store.put("a", csv(100))
+    built = []
+
+    def build(df):
+        built.append(1)
+        return np.zeros(100_000)
+
+    store.get_aggregate("a", "scores", build, run=(1, None))
+    store.get_aggregate("a", "scores", build, run=(1, None))
+    size = store.get("a").nbytes
+    store.get_aggregate("a", "scores", build, run=(2, None))
+
+    assert len(built) == 2
+    assert list(store.get("a").aggregates) == ["scores"]
+    assert store.get("a").nbytes == size
\ No newline at end of file
@@ -0,0 +1,51 @@
+"""Drift Monitoring Tests"""
+import numpy as np
+from scipy.stats import ks_2samp
+from ml.drift import DriftReference, population_stability_index, binned_ks
+
+def test_psi_and_ks_of_known_proportions():
+    expected = np.array([[0.5, 0.5], [0.25, 0.75]])
+    actual = np.array([[0.25, 0.75], [0.25, 0.75]])
+
+    # -0.25 * ln(0.5) + 0.25 * ln(1.5)
+    np.testing.assert_allclose(population_stability_index(expected, actual), [0.2747, 0.0], atol=1e-4)
+    np.testing.assert_allclose(binned_ks(expected, actual), [0.25, 0.0])
+
+def test_empty_bins_keep_psi_finite():
+    psi = population_stability_index(np.array([[1.0, 0.0]]), np.array([[0.0, 1.0]]))
+    assert np.isfinite(psi).all() and psi[0] > 10
+
+def test_reports_only_the_shifted_feature():
+    rng = np.random.default_rng(0)
+    train = rng.normal(size=(50_000, 3))
+    reference = DriftReference().fit(train, ["tenure", "charges", "tickets"])
+
+    new = rng.normal(size=(50_000, 3))
+    new[:, 1] += 0.5
+    new[:, 2] = rng.normal(scale=1.05, size=len(new))
+    report = reference.accumulator().update(new).report(psi_threshold=0.2)
+    features = {f["feature"]: f for f in report["features"]}
+
+    # A half-sigma mean shift has a PSI of about 0.25 (mu squared for continuous normals)
+    assert 0.2 <= features["charges"]["psi"] <= 0.3
+    assert features["charges"]["status"] == "drift"
+    # With decile bins the KS score is close to the exact two-sample statistic
+    exact_ks = ks_2samp(train[:, 1], new[:, 1]).statistic
+    assert abs(features["charges"]["ks"] - exact_ks) < 0.02
+
+    assert features["tenure"]["psi"] < 0.01 and features["tenure"]["status"] == "stable"
+    assert features["tickets"]["status"] == "stable"
+    assert report["drifted_features"] == ["charges"]
+    assert report["features"][0]["feature"] == "charges"
+
+def test_batches_accumulate_to_the_single_pass_result():
+    rng = np.random.default_rng(1)
+    reference = DriftReference().fit(rng.normal(size=(5_000, 2)), ["a", "b"])
+    new = rng.normal(loc=0.3, size=(6_000, 2))
+
+    whole = reference.accumulator().update(new).report()
+    batched = reference.accumulator()
+    for batch in np.array_split(new, 7):
+        batched.update(batch)
+    assert batched.report() == whole
+    assert whole["rows"] == 6_000
\ No newline at end of file
@@ -0,0 +1,41 @@
+"""Dashboard Event Tests"""
+import asyncio
+from services.event_service import DashboardEventBroadcaster
+
+def test_observe_publishes_only_new_versions():
+    events = DashboardEventBroadcaster()
+    events.observe("a", "1")
+    events.observe("a", "1")
+    assert events.current_version("a") == 1
+
+    events.observe("a", "2")
+    assert events.current_version("a") == 2
+
+def test_subscribers_notice_versions_published_elsewhere():
+    # Stands in for another worker rewriting CURRENT: nothing calls publish in this process
+    events = DashboardEventBroadcaster(keepalive_seconds=60.0, poll_seconds=0.01)
+    published = {"version": "1"}
+    events.observe("a", published["version"])
+
+    async def first_change():
+        since = events.current_version("a")
+        async for change in events.subscribe("a", since, poll=lambda: published["version"]):
+            return change
+
+    async def run():
+        waiter = asyncio.ensure_future(first_change())
+        await asyncio.sleep(0.05)
+        assert not waiter.done()
+        published["version"] = "2"
+        return await asyncio.wait_for(waiter, timeout=1.0)
+
+    assert asyncio.run(run()) == (2, "dataset")
+
+def test_keepalive_without_changes():
+    events = DashboardEventBroadcaster(keepalive_seconds=0.05, poll_seconds=0.01)
+
+    async def first_change():
+        async for change in events.subscribe("a", 0, poll=lambda: None):
+            return change
+
+    assert asyncio.run(asyncio.wait_for(first_change(), timeout=1.0)) is None
\ No newline at end of file
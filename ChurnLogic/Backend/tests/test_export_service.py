@@ -0,0 +1,99 @@
+"""Export Tests"""
+import io
+import gzip
+import json
+import pandas as pd
+import pytest
+from sqlalchemy import delete, insert
+from config import settings
+from db.database import SessionLocal, init_db
+from db.models import Cluster, Prediction
+from services.dataset_store import dataset_store
+from services.export_service import SCORE_COLUMNS, ExportAborted, export_service
+
+DATASET_ID = "export_test"
+# Tenure 3 is New (0-6m), 18 Established (1-2y); charge 30 is Budget, 95 Enterprise
+CUSTOMERS = pd.DataFrame({
+    "customer_id": [f"C{i}" for i in range(10)],
+    "tenure": [3, 18] * 5,
+    "monthly_charges": [30.0] * 5 + [95.0] * 5,
+    "churn": [1, 0] * 5
+})
+PROBABILITIES = [0.9, 0.1, 0.8, 0.2, 0.7, 0.3, 0.6, 0.4, 0.5, 0.05]
+RISK_LEVELS = ["HIGH", "LOW", "HIGH", "LOW", "HIGH", "LOW", "MEDIUM", "LOW", "MEDIUM", "LOW"]
+
+def score(db, probabilities):
+    db.execute(delete(Prediction).where(Prediction.dataset_id == DATASET_ID))
+    db.execute(insert(Prediction), [
+        {"customer_id": c, "dataset_id": DATASET_ID, "churn_probability": p, "risk_level": r}
+        for c, p, r in zip(CUSTOMERS["customer_id"], probabilities, RISK_LEVELS)
+    ])
+    db.commit()
+
+@pytest.fixture
+def db():
+    init_db()
+    dataset_store.put(DATASET_ID, io.BytesIO(CUSTOMERS.to_csv(index=False).encode()))
+    session = SessionLocal()
+    score(session, PROBABILITIES)
+    session.execute(delete(Cluster).where(Cluster.dataset_id == DATASET_ID))
+    session.execute(insert(Cluster), [
+        {"customer_id": f"C{i}", "dataset_id": DATASET_ID, "cluster_id": i % 2, "cluster_name": f"Group {i % 2}"}
+        for i in range(10)
+    ])
+    session.commit()
+    yield session
+    session.close()
+
+def export(db, fmt="csv", compress=True, **filters):
+    prepared = export_service.prepare(DATASET_ID, db, fmt=fmt, **filters)
+    assert prepared["status"] == "ok", prepared
+    return b"".join(export_service.stream(
+        DATASET_ID, fmt, prepared["last_id"],
+        prepared["risk_levels"], prepared["clusters"], prepared["segments"], compress
+    ))
+
+def test_gzipped_csv_round_trips(db):
+    df = pd.read_csv(io.BytesIO(gzip.decompress(export(db))))
+
+    assert list(df.columns) == list(CUSTOMERS.columns) + SCORE_COLUMNS
+    assert df["customer_id"].tolist() == CUSTOMERS["customer_id"].tolist()
+    assert df["churn_probability"].tolist() == PROBABILITIES
+    assert df["cluster_name"].tolist() == [f"Group {i % 2}" for i in range(10)]
+    assert df["segment"].iloc[0] == "New (0-6m) / Budget ($0-40)"
+    assert df["segment"].iloc[9] == "Established (1-2y) / Enterprise ($90+)"
+
+def test_ndjson_and_parquet_hold_the_same_rows(db):
+    records = [json.loads(line) for line in gzip.decompress(export(db, "ndjson")).decode().splitlines()]
+    assert [r["risk_level"] for r in records] == RISK_LEVELS
+
+    pytest.importorskip("pyarrow")
+    df = pd.read_parquet(io.BytesIO(export(db, "parquet")))
+    assert df["churn_probability"].tolist() == PROBABILITIES
+    assert df["cluster_id"].tolist() == [i % 2 for i in range(10)]
+
+def test_filters(db):
+    def ids(**filters):
+        return pd.read_csv(io.BytesIO(export(db, compress=False, **filters)))["customer_id"].tolist()
+
+    assert ids(risk_levels=["high"]) == ["C0", "C2", "C4"]
+    assert ids(clusters=[1]) == ["C1", "C3", "C5", "C7", "C9"]
+    assert ids(segments=["Enterprise ($90+)"]) == ["C5", "C6", "C7", "C8", "C9"]
+    assert ids(risk_levels=["MEDIUM"], segments=["New (0-6m) / Enterprise ($90+)"]) == ["C6", "C8"]
+
+def test_rejects_unknown_filters(db):
+    assert export_service.prepare(DATASET_ID, db, risk_levels=["SEVERE"])["status"] == "error"
+    assert export_service.prepare(DATASET_ID, db, segments=["Ancient"])["status"] == "error"
+    assert export_service.prepare(DATASET_ID, db, clusters=[7])["message"] == "Unknown cluster: 7"
+    assert export_service.prepare(DATASET_ID, db, fmt="xlsx")["status"] == "error"
+
+def test_aborts_when_predictions_are_replaced_mid_export(db, monkeypatch):
+    monkeypatch.setattr(settings, "EXPORT_CHUNK_ROWS", 3)
+    prepared = export_service.prepare(DATASET_ID, db)
+    stream = export_service.stream(DATASET_ID, "csv", prepared["last_id"], compress=False)
+    first = next(stream)
+    assert first.startswith(b"customer_id,")
+
+    score(db, [0.5] * 10)
+    with pytest.raises(ExportAborted):
+        b"".join(stream)
\ No newline at end of file
@@ -0,0 +1,82 @@
+"""Retention Strategy Tests"""
+import io
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import delete, insert
+from db.database import SessionLocal, init_db
+from db.models import CampaignRecommendation, Prediction
+from services.dataset_store import dataset_store
+from services.insight_service import insight_service
+
+DATASET_ID = "strategy_test"
+OTHER_DATASET_ID = "strategy_other"
+
+def make_customers(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "customer_id": [f"C{i}" for i in range(n)],
+        "tenure": rng.integers(1, 72, size=n),
+        "monthly_charges": rng.uniform(20, 120, size=n).round(2),
+        "churn": rng.integers(0, 2, size=n)
+    })
+
+def score(db, dataset_id, customers, high_share):
+    # The first high_share of customers are HIGH risk, the rest LOW
+    n_high = int(len(customers) * high_share)
+    db.execute(delete(Prediction).where(Prediction.dataset_id == dataset_id))
+    db.execute(insert(Prediction), [
+        {
+            "customer_id": c, "dataset_id": dataset_id,
+            "churn_probability": 0.8 if i < n_high else 0.1,
+            "risk_level": "HIGH" if i < n_high else "LOW"
+        }
+        for i, c in enumerate(customers["customer_id"])
+    ])
+    db.commit()
+
+@pytest.fixture
+def db():
+    init_db()
+    session = SessionLocal()
+    customers = make_customers()
+    for dataset_id in (DATASET_ID, OTHER_DATASET_ID):
+        dataset_store.put(dataset_id, io.BytesIO(customers.to_csv(index=False).encode()))
+        score(session, dataset_id, customers, high_share=0.5)
+        session.execute(delete(CampaignRecommendation).where(CampaignRecommendation.dataset_id == dataset_id))
+    session.commit()
+    yield session
+    session.close()
+
+def test_saved_strategies_reload_as_generated(db):
+    generated = insight_service.generate_strategies(DATASET_ID, db, limit=4)
+    assert 0 < len(generated) <= 4
+
+    # A separate session, as a later request or another worker would use
+    fresh = SessionLocal()
+    try:
+        saved = insight_service.get_saved_strategies(DATASET_ID, fresh)
+    finally:
+        fresh.close()
+    assert saved["strategies"] == generated
+    assert saved["generated_at"] is not None
+
+def test_regenerating_replaces_only_that_dataset(db):
+    insight_service.generate_strategies(OTHER_DATASET_ID, db)
+    other = insight_service.get_saved_strategies(OTHER_DATASET_ID, db)["strategies"]
+
+    insight_service.generate_strategies(DATASET_ID, db, limit=6)
+    latest = insight_service.generate_strategies(DATASET_ID, db, limit=2)
+
+    assert insight_service.get_saved_strategies(DATASET_ID, db)["strategies"] == latest
+    assert insight_service.get_saved_strategies(OTHER_DATASET_ID, db)["strategies"] == other
+
+def test_reading_does_not_regenerate(db):
+    generated = insight_service.generate_strategies(DATASET_ID, db)
+    score(db, DATASET_ID, make_customers(), high_share=0.1)
+
+    assert insight_service.get_saved_strategies(DATASET_ID, db)["strategies"] == generated
+    assert insight_service.generate_strategies(DATASET_ID, db) != generated
+
+def test_nothing_saved(db):
+    assert insight_service.get_saved_strategies(DATASET_ID, db) == {"strategies": [], "generated_at": None}
\ No newline at end of file
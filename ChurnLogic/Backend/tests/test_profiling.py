@@ -0,0 +1,112 @@
+"""Data Profiling Tests"""
+import numpy as np
+import pandas as pd
+from services.profiling import HyperLogLog, KLLSketch, DataProfile
+
+def hashes(values):
+    return pd.util.hash_array(np.asarray(values))
+
+def test_hyperloglog_is_exact_for_small_columns():
+    hll = HyperLogLog()
+    hll.update(hashes(np.arange(500)))
+    hll.update(hashes(np.arange(250, 750)))
+    assert hll.count() == 750
+
+def test_hyperloglog_error_stays_within_bounds():
+    # Standard error is 1.04 / sqrt(4096), about 1.6%; allow three of those
+    for n in [5_000, 100_000, 1_000_000]:
+        hll = HyperLogLog()
+        for chunk in np.array_split(np.arange(n), 10):
+            hll.update(hashes(chunk))
+            hll.update(hashes(chunk))
+        assert abs(hll.count() - n) / n < 0.05, n
+
+        restored = HyperLogLog.from_dict(hll.to_dict())
+        assert restored.count() == hll.count()
+
+def test_kll_quantiles_within_rank_error():
+    rng = np.random.default_rng(0)
+    values = rng.lognormal(size=500_000)
+    sketch = KLLSketch()
+    for chunk in np.array_split(values, 50):
+        sketch.update(chunk)
+
+    qs = [0.01, 0.25, 0.5, 0.75, 0.99]
+    ordered = np.sort(values)
+    for q, estimate in zip(qs, sketch.quantiles(qs)):
+        true_rank = np.searchsorted(ordered, estimate) / len(values)
+        assert abs(true_rank - q) < 0.02, q
+
+    edges = np.quantile(values, [0.1, 0.5, 0.9])
+    for edge, rank in zip(edges, sketch.rank(edges)):
+        assert abs(rank - np.sum(values <= edge)) < 0.02 * len(values)
+
+    # Memory stays bounded: a few levels of at most k items
+    assert sum(len(level) for level in sketch.levels) < 3 * sketch.k
+
+def test_kll_is_exact_below_capacity():
+    sketch = KLLSketch()
+    sketch.update(np.array([3.0, 1.0, np.nan, 2.0, 2.0]))
+    assert sketch.n == 4
+    assert sketch.quantiles([0.5]) == [2.0]
+    assert sketch.rank([0.0, 1.0, 2.0, 10.0]) == [0, 1, 3, 4]
+
+def test_churned_sketch_matches_a_groupby():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({
+        "tenure": rng.integers(0, 60, size=150),
+        "Churn": rng.integers(0, 2, size=150)
+    })
+    profile = DataProfile()
+    for start in range(0, len(df), 50):
+        profile.update(df.iloc[start:start + 50])
+    profile = DataProfile.from_dict(profile.to_dict())
+
+    assert profile.target_col == "Churn"
+    tenure = profile.columns["tenure"]
+    churned = df.loc[df["Churn"] == 1, "tenure"]
+    assert tenure.churned_sketch.n == len(churned)
+    assert tenure.churned_sketch.rank([12]) == [int((churned <= 12).sum())]
+
+def test_warnings_flag_bad_columns():
+    df = pd.DataFrame({
+        "customer_id": [1, 1] + list(range(2, 12)),
+        "monthly_charges": [10.0, None] + [30.0] * 10,
+        "region": ["eu"] * 12,
+        "tenure": ["n/a"] + [str(m) for m in range(11)]
+    })
+    profile = DataProfile()
+    profile.update(df)
+    warnings = "\n".join(profile.warnings(target_col=None, id_col="customer_id"))
+
+    assert "No churn column" in warnings
+    assert "'monthly_charges' has 1 missing values" in warnings
+    assert "'region' has a single value" in warnings
+    assert "'customer_id' has duplicate IDs" in warnings
+    assert "'tenure' is numeric but 1 values are not numbers (e.g. 'n/a')" in warnings
+
+def test_dashboard_reads_segments_from_the_sketches():
+    from api.routes import _dashboard_summary
+
+    df = pd.DataFrame({
+        "tenure": [0, 3, 6, 7, 12, 30, 40],
+        "monthly_charges": [20.0, 45.0, 80.0, 95.0, None, 39.0, 70.0],
+        "churn": [1, 1, 0, 1, 0, 0, 0]
+    })
+    profile = DataProfile()
+    profile.update(df)
+    summary = _dashboard_summary(profile)
+
+    assert summary["total_customers"] == 7
+    assert summary["at_risk"] == 3
+    assert summary["avg_monthly_charge"] == round(df["monthly_charges"].mean(), 2)
+    # Tenure 0 falls outside every segment, as it does with pd.cut
+    assert summary["retention_by_segment"] == [
+        {"segment": "New (0-6m)", "retention_rate": 50.0, "count": 2},
+        {"segment": "Growing (6-12m)", "retention_rate": 50.0, "count": 2},
+        {"segment": "Loyal (2y+)", "retention_rate": 100.0, "count": 2}
+    ]
+    assert summary["behavior_segments"] == [
+        {"segment": "Budget", "count": 2}, {"segment": "Standard", "count": 2},
+        {"segment": "Premium", "count": 1}, {"segment": "Enterprise", "count": 1}
+    ]
\ No newline at end of file
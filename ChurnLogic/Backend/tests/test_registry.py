@@ -0,0 +1,27 @@
+"""Model Registry Tests"""
+import numpy as np
+from ml.registry import ModelRegistry
+
+def test_keeps_only_the_most_recently_used_models(tmp_path):
+    registry = ModelRegistry(str(tmp_path), max_loaded=2)
+    for dataset_id in ["a", "b", "c"]:
+        registry.save(dataset_id, "v1", {"weights": np.arange(3)})
+        registry.get_active(dataset_id)
+
+    assert list(registry._active) == ["b", "c"]
+
+    # Using b makes c the least recently used
+    registry.get_active("b")
+    registry.get_active("a")
+    assert list(registry._active) == ["b", "a"]
+    np.testing.assert_array_equal(registry.get_active("c")["weights"], [0, 1, 2])
+
+def test_reloads_when_another_worker_activates_a_version(tmp_path):
+    trainer = ModelRegistry(str(tmp_path))
+    server = ModelRegistry(str(tmp_path))
+    trainer.save("a", "v1", {"weights": np.zeros(2)})
+    assert server.get_active("a")["weights"].sum() == 0
+
+    trainer.save("a", "v2", {"weights": np.ones(2)})
+    assert server.get_active("a")["weights"].sum() == 2
+    assert server.get_active("b") is None
\ No newline at end of file
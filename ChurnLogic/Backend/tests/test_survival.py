@@ -0,0 +1,23 @@
+"""Kaplan-Meier Tests"""
+import numpy as np
+import pandas as pd
+from config import settings
+from services.survival_service import SurvivalService
+
+def test_kaplan_meier_matches_hand_computed_curve(monkeypatch):
+    monkeypatch.setattr(settings, "SURVIVAL_MAX_MONTHS", 5)
+    # The churner at month 7 is past the horizon, so it is censored at month 5, not an event
+    df = pd.DataFrame({"tenure": [1, 2, 2, 3, 4, 7], "churn": [1, 1, 0, 1, 0, 1]})
+    counts = SurvivalService._build_counts("test", df, "none", db=None)
+
+    np.testing.assert_array_equal(counts["exits"], [[0, 1, 2, 1, 1, 1]])
+    np.testing.assert_array_equal(counts["events"], [[0, 1, 1, 1, 0, 0]])
+
+    curves = SurvivalService.kaplan_meier(counts["events"], counts["exits"])
+    np.testing.assert_array_equal(curves["at_risk"], [[6, 6, 5, 3, 2, 1]])
+    np.testing.assert_allclose(curves["hazard"], [[0, 1 / 6, 1 / 5, 1 / 3, 0, 0]])
+    np.testing.assert_allclose(curves["survival"], [[1, 5 / 6, 2 / 3, 4 / 9, 4 / 9, 4 / 9]])
+
+    # Greenwood at month 3: 1/(6*5) + 1/(5*4) + 1/(3*2) = 1/4, so the standard error is S/2
+    np.testing.assert_allclose(curves["lower"][0, 3], 4 / 9 - 1.96 * 2 / 9)
+    np.testing.assert_allclose(curves["upper"][0, 3], 4 / 9 + 1.96 * 2 / 9)
\ No newline at end of file
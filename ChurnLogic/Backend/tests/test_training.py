@@ -0,0 +1,49 @@
+"""Training Orchestrator Tests"""
+import numpy as np
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import StratifiedKFold
+from ml.training import TrainingOrchestrator, score_probabilities
+
+def make_data(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 4))
+    y = (X[:, 0] + 0.5 * rng.normal(size=n) > 0).astype(int)
+    return X, y
+
+CANDIDATES = {
+    "forest": RandomForestClassifier(n_estimators=20, random_state=0, n_jobs=-1),
+    "logistic": LogisticRegression(max_iter=1000)
+}
+
+def test_parallel_run_matches_a_sequential_loop():
+    X, y = make_data()
+    fitted, metrics = TrainingOrchestrator(n_folds=3, n_jobs=2).run(CANDIDATES, X, y)
+
+    for name, estimator in CANDIDATES.items():
+        scores = []
+        for train_idx, test_idx in StratifiedKFold(n_splits=3, shuffle=True, random_state=42).split(X, y):
+            model = clone(estimator).fit(X[train_idx], y[train_idx])
+            scores.append(score_probabilities(y[test_idx], model.predict_proba(X[test_idx])[:, 1]))
+        assert metrics[name]["n_folds"] == 3
+        assert np.isclose(metrics[name]["roc_auc"], np.mean([s["roc_auc"] for s in scores]))
+        assert np.isclose(metrics[name]["f1_std"], np.std([s["f1"] for s in scores]))
+
+        reference = clone(estimator).fit(X, y)
+        np.testing.assert_allclose(fitted[name].predict_proba(X), reference.predict_proba(X))
+
+def test_fitted_models_outlive_the_shared_arrays():
+    X, y = make_data()
+    fitted, _ = TrainingOrchestrator(n_folds=2, n_jobs=2).run(CANDIDATES, X, y)
+
+    # The memmapped training copy is gone; the models must not depend on it
+    assert fitted["forest"].predict(X).shape == (len(X),)
+    assert fitted["forest"].get_params()["n_jobs"] == -1
+
+def test_folds_are_capped_by_the_smaller_class():
+    X, y = make_data(n=60)
+    y[:] = 0
+    y[:3] = 1
+    _, metrics = TrainingOrchestrator(n_folds=5, n_jobs=1).run({"logistic": CANDIDATES["logistic"]}, X, y)
+    assert metrics["logistic"]["n_folds"] == 3
\ No newline at end of file
@@ -0,0 +1,57 @@
+"""Hyperparameter Search Tests"""
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from ml.tuning import SuccessiveHalvingSearch
+
+SMALL_SPACE = {
+    'n_estimators': [5, 10, 15],
+    'max_depth': [2, 3, 4],
+    'min_samples_leaf': [1, 5, 10]
+}
+
+def make_data(n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 4))
+    y = (X[:, 0] - X[:, 1] + rng.normal(size=n) > 0).astype(int)
+    return X, y
+
+def make_search(**kwargs):
+    return SuccessiveHalvingSearch(
+        RandomForestClassifier(random_state=0), SMALL_SPACE, n_jobs=1, **kwargs
+    )
+
+def test_rounds_keep_a_third_on_three_times_the_rows():
+    X, y = make_data()
+    search = make_search(n_candidates=27, eta=3, min_rows=200)
+    search.search(X, y)
+
+    rounds = search.results['rounds']
+    # 2250 training rows after the 25% validation split
+    assert [r['rows'] for r in rounds] == [250, 750, 2250]
+    assert [r['candidates'] for r in rounds] == [27, 9, 3]
+    assert len(search.results['finalists']) == 3
+
+def test_small_datasets_start_at_min_rows():
+    X, y = make_data(n=800)
+    search = make_search(n_candidates=9, eta=3, min_rows=200)
+    search.search(X, y)
+    assert [r['rows'] for r in search.results['rounds']] == [200, 600]
+
+def test_stops_when_the_next_round_would_exceed_the_budget():
+    X, y = make_data()
+    search = make_search(n_candidates=27, cpu_budget_seconds=0.0)
+    search.search(X, y)
+
+    assert len(search.results['rounds']) == 1
+    # Everything from the only round is a finalist; nothing was cut without being compared
+    assert len(search.results['finalists']) == 27
+
+def test_picks_the_cheapest_finalist_within_tolerance():
+    X, y = make_data()
+    search = make_search(n_candidates=27, auc_tolerance=1.0)
+    best_params = search.search(X, y)
+
+    finalists = search.results['finalists']
+    cheapest = min(finalists, key=lambda f: f['n_nodes'])
+    assert best_params == cheapest['params']
+    assert search.results['n_nodes'] == cheapest['n_nodes']
\ No newline at end of file
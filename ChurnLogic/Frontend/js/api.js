@@ -1,139 +1,182 @@
-/**
- * API Service
- * Handles all backend API calls
- */
-
-const API_BASE_URL = 'http://localhost:8000/api';
-
-const api = {
-    /**
-     * GET request
-     */
-    async get(endpoint) {
-        try {
-            const response = await fetch(`${API_BASE_URL}${endpoint}`);
-            if (!response.ok) {
-                throw new Error(`HTTP error! status: ${response.status}`);
-            }
-            return await response.json();
-        } catch (error) {
-            console.error('API GET Error:', error);
-            return null;
-        }
-    },
-
-    /**
-     * POST request with JSON
-     */
-    async post(endpoint, data) {
-        try {
-            const response = await fetch(`${API_BASE_URL}${endpoint}`, {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify(data)
-            });
-            if (!response.ok) {
-                throw new Error(`HTTP error! status: ${response.status}`);
-            }
-            return await response.json();
-        } catch (error) {
-            console.error('API POST Error:', error);
-            return null;
-        }
-    },
-
-    /**
-     * File upload
-     */
-    async uploadFile(endpoint, file) {
-        try {
-            const formData = new FormData();
-            formData.append('file', file);
-            
-            const response = await fetch(`${API_BASE_URL}${endpoint}`, {
-                method: 'POST',
-                body: formData
-            });
-            
-            if (!response.ok) {
-                throw new Error(`HTTP error! status: ${response.status}`);
-            }
-            return await response.json();
-        } catch (error) {
-            console.error('Upload Error:', error);
-            return null;
-        }
-    },
-
-    /**
-     * GET Dashboard Data
-     */
-    async getDashboardData() {
-        return this.get('/dashboard-data');
-    },
-
-    /**
-     * Upload CSV File
-     */
-    async uploadDataset(file) {
-        return this.uploadFile('/upload-data', file);
-    },
-
-    /**
-     * Train Model
-     */
-    async trainModel() {
-        return this.post('/train-model', {});
-    },
-
-    /**
-     * Get Predictions
-     */
-    async getPredictions() {
-        return this.get('/predict-churn');
-    },
-
-    /**
-     * Get Model Metrics
-     */
-    async getModelMetrics() {
-        return this.get('/model-metrics');
-    },
-
-    /**
-     * Get Feature Importance
-     */
-    async getFeatureImportance() {
-        return this.get('/feature-importance');
-    },
-
-    /**
-     * Cluster Customers
-     */
-    async clusterCustomers() {
-        return this.post('/cluster-users', {});
-    },
-
-    /**
-     * Get Cluster Summary
-     */
-    async getClusterSummary() {
-        return this.get('/cluster-summary');
-    },
-
-    /**
-     * Simulate Scenario
-     */
-    async simulateScenario(params) {
-        return this.post('/simulate-scenario', params);
-    },
-
-    /**
-     * Generate Retention Strategy
-     */
-    async generateRetentionStrategy() {
-        return this.post('/generate-retention-strategy', {});
-    }
+/**
+ * API Service
+ * Handles all backend API calls
+ */
+
+const API_BASE_URL = 'http://localhost:8000/api';
+
+const api = {
+    /**
+     * GET request
+     */
+    async get(endpoint) {
+        try {
+            const response = await fetch(`${API_BASE_URL}${endpoint}`);
+            if (!response.ok) {
+                throw new Error(`HTTP error! status: ${response.status}`);
+            }
+            return await response.json();
+        } catch (error) {
+            console.error('API GET Error:', error);
+            return null;
+        }
+    },
+
+    /**
+     * POST request with JSON
+     */
+    async post(endpoint, data) {
+        try {
+            const response = await fetch(`${API_BASE_URL}${endpoint}`, {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify(data)
+            });
+            if (!response.ok) {
+                throw new Error(`HTTP error! status: ${response.status}`);
+            }
+            return await response.json();
+        } catch (error) {
+            console.error('API POST Error:', error);
+            return null;
+        }
+    },
+
+    /**
+     * File upload
+     */
+    async uploadFile(endpoint, file) {
+        try {
+            const formData = new FormData();
+            formData.append('file', file);
+            
+            const response = await fetch(`${API_BASE_URL}${endpoint}`, {
+                method: 'POST',
+                body: formData
+            });
+            
+            if (!response.ok) {
+                throw new Error(`HTTP error! status: ${response.status}`);
+            }
+            return await response.json();
+        } catch (error) {
+            console.error('Upload Error:', error);
+            return null;
+        }
+    },
+
+    /**
+     * GET Dashboard Data
+     */
+    async getDashboardData() {
+        return this.get('/dashboard-data');
+    },
+
+    /**
+     * Subscribe to dashboard updates pushed by the server.
+     * onSnapshot receives the full dashboard data, onDiff only the changed keys.
+     * Returns the EventSource so callers can close() it.
+     */
+    subscribeDashboard(onSnapshot, onDiff) {
+        const source = new EventSource(`${API_BASE_URL}/dashboard-stream`);
+        source.addEventListener('snapshot', event => onSnapshot(JSON.parse(event.data)));
+        source.addEventListener('diff', event => onDiff(JSON.parse(event.data).changes));
+        source.onerror = () => console.warn('Dashboard stream interrupted, reconnecting...');
+        return source;
+    },
+
+    /**
+     * Search Customers
+     * filters: prefix, min_tenure, max_tenure, min_charge, max_charge,
+     * min_probability, max_probability, risk, cluster, sort, offset, limit
+     */
+    async searchCustomers(filters = {}) {
+        const query = new URLSearchParams(
+            Object.entries(filters).filter(([, value]) => value !== undefined && value !== null && value !== '')
+        );
+        return this.get(`/customers/search?${query}`);
+    },
+
+    /**
+     * Scored Customers Export URL, for use as a download link
+     * filters: format (csv, ndjson, parquet), risk, cluster, segment, compress
+     */
+    exportCustomersUrl(filters = {}) {
+        const query = new URLSearchParams(
+            Object.entries(filters).filter(([, value]) => value !== undefined && value !== null && value !== '')
+        );
+        return `${API_BASE_URL}/export/customers?${query}`;
+    },
+
+    /**
+     * Upload CSV File
+     */
+    async uploadDataset(file) {
+        return this.uploadFile('/upload-data', file);
+    },
+
+    /**
+     * Train Model
+     */
+    async trainModel() {
+        return this.post('/train-model', {});
+    },
+
+    /**
+     * Get Predictions
+     */
+    async getPredictions() {
+        return this.get('/predict-churn');
+    },
+
+    /**
+     * Get Model Metrics
+     */
+    async getModelMetrics() {
+        return this.get('/model-metrics');
+    },
+
+    /**
+     * Get Feature Importance
+     */
+    async getFeatureImportance() {
+        return this.get('/feature-importance');
+    },
+
+    /**
+     * Cluster Customers
+     */
+    async clusterCustomers() {
+        return this.post('/cluster-users', {});
+    },
+
+    /**
+     * Get Cluster Summary
+     */
+    async getClusterSummary() {
+        return this.get('/cluster-summary');
+    },
+
+    /**
+     * Simulate Scenario
+     */
+    async simulateScenario(params) {
+        return this.post('/simulate-scenario', params);
+    },
+
+    /**
+     * Get Saved Retention Strategy
+     */
+    async getRetentionStrategy() {
+        return this.get('/retention-strategy');
+    },
+
+    /**
+     * Generate Retention Strategy
+     */
+    async generateRetentionStrategy() {
+        return this.post('/generate-retention-strategy', {});
+    }
 };
\ No newline at end of file